@@ -6,7 +6,16 @@ Starts immediately in chat mode with AI assistant.
 
 import sys
 import os
-from dotenv import load_dotenv
+import re
+import asyncio
+from src.env import load_dotenv
+
+try:
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.patch_stdout import patch_stdout
+    PROMPT_TOOLKIT_AVAILABLE = True
+except ImportError:
+    PROMPT_TOOLKIT_AVAILABLE = False
 
 # Load environment variables from .env file
 load_dotenv()
@@ -14,9 +23,32 @@ load_dotenv()
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.server import chat
+# Messages mentioning GitHub/repo/issue/PR/deployment automatically include GitHub context
+GITHUB_KEYWORDS_RE = re.compile(
+    r'\b(?:github|repos?|repository|repositories|issues?|prs?|pull\s+requests?|commits?|'
+    r'deploy(?:s|ed|ing|ments?)?|production|staging)\b',
+    re.IGNORECASE
+)
+
+def warm_up_clients(server):
+    """Initialize the calendar and Gemini clients ahead of the first question."""
+    for initialize in (server.initialize_calendar_client, server.initialize_gemini_client):
+        try:
+            initialize()
+        except Exception:
+            # chat() retries initialization and reports the error to the user
+            pass
+
+async def read_message(session):
+    """Read one line from the user (without blocking the event loop when prompt_toolkit is available)."""
+    if session is None:
+        # Plain blocking input(): reading on a worker thread would leave it stuck
+        # in input() after Ctrl-C, keeping the process alive until Enter is pressed
+        return input("You: ")
+    with patch_stdout():
+        return await session.prompt_async("You: ")
 
-def main():
+async def main():
     """Main chat interface."""
     print("\n" + "=" * 70)
     print(" " * 20 + "Calendar & GitHub AI Assistant")
@@ -37,10 +69,18 @@ def main():
     print("\nType 'exit' or 'quit' to end the conversation.")
     print("=" * 70)
     
+    # Imported after the banner: src.server pulls in the Google, Gemini and
+    # Slack SDKs, which takes noticeably longer than printing the welcome text
+    from src import server
+    
+    # Authenticate with Google/Gemini in the background while the user types
+    warm_up = asyncio.create_task(asyncio.to_thread(warm_up_clients, server))
+    session = PromptSession() if PROMPT_TOOLKIT_AVAILABLE else None
+    
     while True:
         try:
             print()
-            message = input("You: ").strip()
+            message = (await read_message(session)).strip()
             
             if not message:
                 continue
@@ -54,18 +94,18 @@ def main():
             # Get AI response
             print("\nAssistant: ", end="", flush=True)
             try:
-                # Automatically include GitHub context if message mentions GitHub/repo/issue/PR/deployment
-                message_lower = message.lower()
-                include_github = any(keyword in message_lower for keyword in 
-                                   ['github', 'repo', 'repository', 'issue', 'pr', 'pull request', 'commit',
-                                    'deployment', 'deploy', 'deployed', 'deploying', 'production', 'staging'])
+                include_github = GITHUB_KEYWORDS_RE.search(message) is not None
                 
-                result = chat(message, include_calendar_context=True, include_github_context=include_github)
+                await warm_up
+                result = await asyncio.to_thread(
+                    server.chat, message,
+                    include_calendar_context=True, include_github_context=include_github
+                )
                 print(result)
             except Exception as e:
                 print(f"Error: {e}")
             
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
             print("\n\nInterrupted by user. Goodbye!")
             break
         except EOFError:
@@ -74,7 +114,9 @@ def main():
 
 if __name__ == "__main__":
     try:
-        main()
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n\nInterrupted by user. Goodbye!")
     except Exception as e:
         print(f"\nFatal error: {e}")
         sys.exit(1)
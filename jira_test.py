@@ -2,36 +2,43 @@
 import os
 import sys
 import getpass
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
-ENV_PATH = Path(".env")
+from src.env import load_dotenv, read_dotenv
 
-def load_dotenv():
-    if not ENV_PATH.exists():
-        return
-    for line in ENV_PATH.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        k, v = line.split("=", 1)
-        if k not in os.environ:
-            os.environ[k] = v
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from requests_cache import CachedSession, DO_NOT_CACHE
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+ENV_PATH = Path(".env")
+CACHE_PATH = ".jira_cache"
+CACHE_TTL = 300  # seconds
+MAX_WORKERS = 8
+# Pass on the command line to list the backlogs of all boards instead of the first one
+ALL_BOARDS_FLAG = "--all-boards"
 
 def write_dotenv(values: dict):
-    existing = {}
-    if ENV_PATH.exists():
-        for line in ENV_PATH.read_text(encoding="utf-8").splitlines():
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            k, v = line.split("=", 1)
-            existing[k] = v
+    existing = read_dotenv(ENV_PATH)
     existing.update(values)
-    with ENV_PATH.open("w", encoding="utf-8") as f:
-        f.write("# Jira credentials - DO NOT COMMIT THIS FILE\n")
-        for k, v in existing.items():
-            f.write(f"{k}={v}\n")
+    # Write a sibling temp file and rename it over .env so an interrupted
+    # write never leaves a truncated credentials file behind
+    tmp = ENV_PATH.with_name(ENV_PATH.name + ".tmp")
+    tmp.write_text("# Jira credentials - DO NOT COMMIT THIS FILE\n"
+                   + "".join(f"{k}={v}\n" for k, v in existing.items()), encoding="utf-8")
+    os.replace(tmp, ENV_PATH)
 
 def prompt_if_missing():
     base_url = os.environ.get("JIRA_BASE_URL", "").strip()
@@ -51,118 +58,211 @@ def prompt_if_missing():
         write_dotenv({"JIRA_BASE_URL": base_url, "JIRA_EMAIL": email, "JIRA_API_TOKEN": token})
         os.environ.update({"JIRA_BASE_URL": base_url, "JIRA_EMAIL": email, "JIRA_API_TOKEN": token})
 
-def make_session():
-    s = requests.Session()
-    s.auth = (os.environ["JIRA_EMAIL"], os.environ["JIRA_API_TOKEN"])
+def make_session(base_url):
+    base = base_url.rstrip("/")
+    email, token = os.environ["JIRA_EMAIL"], os.environ["JIRA_API_TOKEN"]
+    if REQUESTS_CACHE_AVAILABLE:
+        # Board listings and configurations rarely change between runs; cache only
+        # those GETs on disk (backlog pages are always fetched live) and revalidate
+        # stale entries with ETag/If-None-Match. Backlog URLs are listed first
+        # because the board prefix would otherwise match them too.
+        agile = f"{base}/rest/agile/1.0/board"
+        url_ttls = {f"{agile}/*/backlog": DO_NOT_CACHE, agile: CACHE_TTL}
+        # requests-cache leaves Authorization out of cache keys, so keep one cache
+        # per site and credentials to never serve another account's responses
+        account = hashlib.blake2b(f"{base}|{email}|{token}".encode("utf-8"), digest_size=8).hexdigest()
+        s = CachedSession(f"{CACHE_PATH}_{account}", backend="sqlite", expire_after=DO_NOT_CACHE,
+                          urls_expire_after=url_ttls, allowable_methods=["GET"], cache_control=True)
+    else:
+        s = requests.Session()
+    s.auth = (email, token)
     s.headers.update({"Accept": "application/json"})
-    return s
+    # Back off on throttling/transient errors (honouring Retry-After) so concurrent
+    # pagination stays polite; the search POST is read-only and safe to retry.
+    # raise_on_status=False hands the final response back for the usual error path.
+    retry = Retry(total=5, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                  allowed_methods=["GET", "POST"], respect_retry_after_header=True,
+                  raise_on_status=False)
+    # Pool sized above MAX_WORKERS so concurrent page fetches reuse connections
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s, f"{base}/rest/agile/1.0/", f"{base}/rest/api/3/"
+
+def parse_json(r):
+    # orjson parses large issue pages several times faster than stdlib json
+    return orjson.loads(r.content) if ORJSON_AVAILABLE else r.json()
 
-def agile_get(session, base_url, endpoint, params=None, ok404=False):
-    url = f"{base_url.rstrip('/')}/rest/agile/1.0/{endpoint}"
-    r = session.get(url, params=params, timeout=30)
+def agile_get(session, agile_prefix, endpoint, params=None, ok404=False):
+    r = session.get(agile_prefix + endpoint, params=params, timeout=30)
     if ok404 and r.status_code == 404:
         return None
     if r.status_code >= 400:
         raise RuntimeError(f"Agile API {r.status_code}: {r.text}")
-    return r.json()
+    return parse_json(r)
 
-def core_get(session, base_url, endpoint, params=None):
+def core_post(session, core_prefix, endpoint, payload):
     # Core (Jira REST v3) for JQL search
-    url = f"{base_url.rstrip('/')}/rest/api/3/{endpoint}"
-    r = session.get(url, params=params, timeout=30)
+    if ORJSON_AVAILABLE:
+        r = session.post(core_prefix + endpoint, data=orjson.dumps(payload),
+                         headers={"Content-Type": "application/json"}, timeout=30)
+    else:
+        r = session.post(core_prefix + endpoint, json=payload, timeout=30)
     if r.status_code >= 400:
         raise RuntimeError(f"Core API {r.status_code}: {r.text}")
-    return r.json()
+    return parse_json(r)
 
-def get_all_boards(session, base_url):
+def effective_batch_size(batch_size, page_len, what):
+    # Jira silently caps maxResults per endpoint; adopt the server's page size
+    if 0 < page_len < batch_size:
+        print(f"Warning: Jira capped {what} page size at {page_len} (requested {batch_size}).")
+        return page_len
+    return batch_size
+
+def get_all_boards(session, agile_prefix, batch_size=1000):
     boards, start = [], 0
     while True:
-        data = agile_get(session, base_url, "board", {"startAt": start, "maxResults": 50})
+        data = agile_get(session, agile_prefix, "board", {"startAt": start, "maxResults": batch_size})
         values = data.get("values", [])
         boards.extend(values)
         if data.get("isLast") or not values:
             break
+        if start == 0:
+            batch_size = effective_batch_size(batch_size, len(values), "board")
         start += len(values)
     return boards
 
-def get_backlog_via_agile(session, base_url, board_id):
-    issues, start = [], 0
-    while True:
-        data = agile_get(session, base_url, f"board/{board_id}/backlog",
-                         {"startAt": start, "maxResults": 50})
-        page = data.get("issues", [])
-        issues.extend(page)
-        total = data.get("total", 0)
-        if start + len(page) >= total or not page:
-            break
-        start += len(page)
-    return issues
+def fetch_pages_concurrently(fetch_page, first_page, total, batch_size):
+    # 'total' is known after the first page, so size the list once and let each
+    # page land in its own slice instead of growing the list page by page
+    items = [None] * total
+    items[:len(first_page)] = first_page
+    offsets = range(len(first_page), total, batch_size)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        for start, page in zip(offsets, pool.map(fetch_page, offsets)):
+            items[start:start + len(page)] = page
+    if None in items:
+        # Short pages (e.g. issues moved out of the backlog mid-fetch) leave gaps
+        items = [item for item in items if item is not None]
+    return items
+
+def get_backlog_via_agile(session, agile_prefix, board_id, batch_size=500, fields="summary,status,assignee"):
+    # Only the fields print_issues shows; full issue bodies are 10x+ larger
+    endpoint = f"board/{board_id}/backlog"
+    data = agile_get(session, agile_prefix, endpoint, {"startAt": 0, "maxResults": batch_size, "fields": fields})
+    issues = data.get("issues", [])
+    total = data.get("total", 0)
+    if not issues or len(issues) >= total:
+        return issues
+    batch_size = effective_batch_size(batch_size, len(issues), "backlog")
+
+    def fetch_page(start):
+        page = agile_get(session, agile_prefix, endpoint, {"startAt": start, "maxResults": batch_size, "fields": fields})
+        return page.get("issues", [])
 
-def get_board_filter_id(session, base_url, board_id):
-    cfg = agile_get(session, base_url, f"board/{board_id}/configuration")
+    return fetch_pages_concurrently(fetch_page, issues, total, batch_size)
+
+def get_board_filter_id(session, agile_prefix, board_id):
+    cfg = agile_get(session, agile_prefix, f"board/{board_id}/configuration")
     flt = (cfg or {}).get("filter")
     return (flt or {}).get("id")
 
-def get_backlog_via_jql(session, base_url, filter_id):
-    # Approximate backlog: issues in this board’s filter without a sprint or only in future sprints
-    jql = f'filter = {filter_id} AND (sprint is EMPTY OR sprint in futureSprints()) ORDER BY created'
-    issues, start = [], 0
+def search_issues(session, core_prefix, jql, fields, batch_size=1000):
+    # /search/jql pages with an opaque nextPageToken cursor, so pages are sequential
+    issues, token = [], None
     while True:
-        data = core_get(session, base_url, "search",
-                        {"jql": jql, "startAt": start, "maxResults": 50, "fields": "summary,status,assignee"})
-        page = data.get("issues", [])
-        issues.extend(page)
-        if start + len(page) >= data.get("total", 0) or not page:
+        payload = {"jql": jql, "maxResults": batch_size, "fields": fields}
+        if token:
+            payload["nextPageToken"] = token
+        data = core_post(session, core_prefix, "search/jql", payload)
+        issues.extend(data.get("issues", []))
+        token = data.get("nextPageToken")
+        if not token:
             break
-        start += len(page)
     return issues
 
+def get_backlog_via_jql(session, core_prefix, filter_id, batch_size=1000):
+    # Approximate backlog: issues in this board’s filter without a sprint or only in future sprints
+    jql = f'filter = {filter_id} AND (sprint is EMPTY OR sprint in futureSprints()) ORDER BY created'
+    return search_issues(session, core_prefix, jql, ["summary", "status", "assignee"], batch_size)
+
+def get_all_board_filters(session, agile_prefix, boards):
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        ids = pool.map(lambda b: get_board_filter_id(session, agile_prefix, b["id"]), boards)
+        return sorted({str(fid) for fid in ids if fid})
+
+def get_backlogs_by_project(session, agile_prefix, core_prefix, boards, batch_size=1000):
+    # One JQL query over every board filter instead of one search per board
+    filter_ids = get_all_board_filters(session, agile_prefix, boards)
+    if not filter_ids:
+        return {}
+    jql = (f'filter in ({",".join(filter_ids)}) '
+           'AND (sprint is EMPTY OR sprint in futureSprints()) ORDER BY created')
+    by_project = {}
+    for issue in search_issues(session, core_prefix, jql, ["summary", "status", "assignee", "project"], batch_size):
+        project = ((issue.get("fields") or {}).get("project") or {}).get("key", "Unknown")
+        by_project.setdefault(project, []).append(issue)
+    return by_project
+
 def print_boards(boards, base_url):
-    print("\nAll Jira boards:")
-    print("-" * 80)
+    lines = ["\nAll Jira boards:", "-" * 80]
+    board_url_prefix = f"{base_url.rstrip('/')}/jira/boards/"
     for b in boards:
         bid = b.get("id")
         name = b.get("name")
         btype = b.get("type")
-        board_url = f"{base_url.rstrip('/')}/jira/boards/{bid}"
+        board_url = board_url_prefix + str(bid)
         loc = b.get("location", {}) or {}
         loc_type = loc.get("type")
         loc_name = loc.get("name")
         loc_suffix = f" | location: {loc_type} - {loc_name}" if (loc_type or loc_name) else ""
-        print(f"[{bid}] {name} ({btype}) -> {board_url}{loc_suffix}")
-    print("-" * 80)
-    print(f"Total boards: {len(boards)}")
+        lines.append(f"[{bid}] {name} ({btype}) -> {board_url}{loc_suffix}")
+    lines.append("-" * 80)
+    lines.append(f"Total boards: {len(boards)}")
+    # One write instead of a print (and possible flush) per board
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def print_issues(issues):
     if not issues:
         print("No backlog issues found.")
         return
-    print("\nBacklog Items:")
-    print("=" * 120)
+    lines = ["\nBacklog Items:", "=" * 120]
     for issue in issues:
         key = issue.get("key")
         fields = issue.get("fields", {})
         summary = fields.get("summary", "No summary")
         status = (fields.get("status") or {}).get("name", "Unknown")
         assignee = ((fields.get("assignee") or {}) or {}).get("displayName", "Unassigned")
-        print(f"{key:<12} | {status:<18} | {assignee:<28} | {summary}")
-    print("=" * 120)
-    print(f"Total backlog issues: {len(issues)}")
+        lines.append(f"{key:<12} | {status:<18} | {assignee:<28} | {summary}")
+    lines.append("=" * 120)
+    lines.append(f"Total backlog issues: {len(issues)}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def main():
-    load_dotenv()
+    load_dotenv(ENV_PATH)
     prompt_if_missing()
 
     base_url = os.environ["JIRA_BASE_URL"]
-    session = make_session()
+    session, agile_prefix, core_prefix = make_session(base_url)
 
     # 1) Boards
-    boards = get_all_boards(session, base_url)
+    boards = get_all_boards(session, agile_prefix)
     if not boards:
         print("No boards found.")
         return
     print_boards(boards, base_url)
 
+    if ALL_BOARDS_FLAG in sys.argv[1:]:
+        # 2) Backlogs for every board: one JQL query over all board filters
+        print(f"\nFetching backlogs for all {len(boards)} boards...")
+        by_project = get_backlogs_by_project(session, agile_prefix, core_prefix, boards)
+        if not by_project:
+            print("No backlog issues found.")
+        for project, issues in sorted(by_project.items()):
+            print(f"\nProject: {project}")
+            print_issues(issues)
+        return
+
     # 2) Backlog for first board
     first = boards[0]
     bid, bname, btype = first["id"], first.get("name"), first.get("type")
@@ -171,18 +271,18 @@ def main():
     issues = []
     try:
         # Preferred: Agile backlog endpoint
-        issues = get_backlog_via_agile(session, base_url, bid)
+        issues = get_backlog_via_agile(session, agile_prefix, bid)
     except RuntimeError as e:
         # Fall through to JQL on errors like 403/404
         print(f"Backlog endpoint not available: {e}\nFalling back to JQL…")
 
     if not issues:
-        # Fallback: JQL using board filter
-        fid = get_board_filter_id(session, base_url, bid)
+        # Fallback: JQL using board filter (only looked up when actually needed)
+        fid = get_board_filter_id(session, agile_prefix, bid)
         if not fid:
             print("Could not resolve board filter; cannot fall back to JQL.")
         else:
-            issues = get_backlog_via_jql(session, base_url, fid)
+            issues = get_backlog_via_jql(session, core_prefix, fid)
 
     print_issues(issues)
 
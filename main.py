@@ -4,8 +4,7 @@
 import sys
 import os
 import logging
-from datetime import datetime
-from dotenv import load_dotenv
+from src.env import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
@@ -13,43 +12,52 @@ load_dotenv()
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-# Configure logging to stderr (stdout is reserved for JSON-RPC)
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    stream=sys.stderr,
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-
 logger = logging.getLogger(__name__)
 
+# Startup banner, logged as a single record; the tool list is read from the
+# MCP server's registry so it always matches what is actually exposed
+BANNER_HEADER = "=" * 60
+BANNER_FOOTER = "\n".join([
+    "=" * 60,
+    "Waiting for client connections...",
+    "(Press Ctrl+C to stop)",
+    "",
+])
+
+def _tool_summary(description):
+    """Return the first sentence of a tool docstring."""
+    lines = (description or "").strip().splitlines()
+    return lines[0].split(". ")[0].rstrip(".") if lines else ""
+
+def format_banner(mcp, started_at):
+    """Build the startup banner from the registered MCP tools."""
+    tools = sorted(mcp._tool_manager.list_tools(), key=lambda t: t.name)
+    return "\n".join([
+        BANNER_HEADER,
+        mcp.name,
+        BANNER_HEADER,
+        f"Starting server at {started_at}",
+        "Server is ready and listening for JSON-RPC messages on stdin/stdout",
+        f"Available tools ({len(tools)}):",
+        *(f"  - {tool.name}: {_tool_summary(tool.description)}" for tool in tools),
+        BANNER_FOOTER,
+    ])
+
 def main():
     """Main entry point for the MCP server."""
+    from datetime import datetime
+
+    # Configure logging to stderr (stdout is reserved for JSON-RPC)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        stream=sys.stderr,
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
     try:
-        logger.info("=" * 60)
-        logger.info("Calendar & GitHub MCP Server")
-        logger.info("=" * 60)
-        logger.info(f"Starting server at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        logger.info("Server is ready and listening for JSON-RPC messages on stdin/stdout")
-        logger.info("Available tools:")
-        logger.info("Calendar Tools:")
-        logger.info("  - get_calendar_context: Get calendar context for queries")
-        logger.info("  - check_availability: Check availability at specific times")
-        logger.info("  - get_upcoming_events: Get upcoming calendar events")
-        logger.info("  - detect_conflicts: Detect scheduling conflicts")
-        logger.info("GitHub Tools:")
-        logger.info("  - get_github_issues: Get issues for a repository")
-        logger.info("  - get_github_pull_requests: Get pull requests for a repository")
-        logger.info("  - get_github_repositories: Get repositories for a user")
-        logger.info("  - get_github_deployments: Get deployments for repositories")
-        logger.info("AI Assistant:")
-        logger.info("  - chat: Chat with AI assistant about calendar and GitHub")
-        logger.info("=" * 60)
-        logger.info("Waiting for client connections...")
-        logger.info("(Press Ctrl+C to stop)")
-        logger.info("")
-        
         from src.server import mcp
+        logger.info("%s", format_banner(mcp, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
         mcp.run()
         
     except KeyboardInterrupt:
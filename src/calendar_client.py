@@ -4,11 +4,16 @@ import os
 import sys
 import json
 import contextlib
+import functools
 import io
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+import httplib2
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
@@ -20,10 +25,180 @@ try:
 except ImportError:
     PYTZ_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ciso8601
+    CISO8601_AVAILABLE = True
+except ImportError:
+    CISO8601_AVAILABLE = False
+
 
 # Scopes required for Google Calendar API
 SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
 
+# Maximum number of calls the Calendar API accepts in one batch request
+BATCH_LIMIT = 50
+
+# How long the primary calendar timezone cached next to the token stays valid (30 days)
+TIMEZONE_CACHE_TTL = 30 * 24 * 60 * 60
+
+# Partial-response mask for events.list; only the fields the context pipeline reads
+EVENT_FIELDS = 'nextPageToken,items(id,summary,description,location,start,end,status)'
+
+# Worker threads used when a batch request fails and calls are issued individually
+MAX_WORKERS = 8
+
+# Authenticated services shared by every client in the process:
+# (credentials_path, token_path) -> (service, credentials, calendar_timezone, service_thread)
+_SERVICE_CACHE: Dict[Tuple[str, str], Tuple[object, Credentials, str, int]] = {}
+
+# Parsed token files: token_path -> (mtime, raw bytes, token info)
+_TOKEN_CACHE: Dict[str, Tuple[float, bytes, Dict]] = {}
+
+# Primary calendar timezone of the most recently authenticated client
+CALENDAR_TIMEZONE: Optional[str] = None
+
+# Shared UTC tzinfo used whenever the calendar timezone is unknown or invalid
+UTC = pytz.UTC if PYTZ_AVAILABLE else timezone.utc
+
+
+@functools.lru_cache(maxsize=64)
+def _tz(name: str):
+    """Return the pytz timezone for an IANA name, memoized across clients."""
+    return pytz.timezone(name)
+
+
+def parse_rfc3339(value: str) -> datetime:
+    """
+    Parse an RFC3339 timestamp or all-day date returned by the Calendar API.
+    
+    Args:
+        value: Timestamp such as '2024-05-01T09:00:00Z' or date such as '2024-05-01'
+    
+    Returns:
+        Parsed datetime (timezone-aware when the value carries an offset)
+    
+    Raises:
+        ValueError: If the value is not a valid timestamp
+    """
+    if CISO8601_AVAILABLE:
+        return ciso8601.parse_datetime(value)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def get_calendar_timezone(default: str = 'UTC') -> str:
+    """
+    Get the primary calendar's timezone name.
+    
+    Args:
+        default: Timezone used when no client has authenticated and CALENDAR_TIMEZONE is not configured
+    
+    Returns:
+        IANA timezone name
+    """
+    return CALENDAR_TIMEZONE or os.environ.get('CALENDAR_TIMEZONE') or default
+
+
+def _read_token_info(token_path: str) -> Optional[Dict]:
+    """
+    Load the saved OAuth token JSON, re-reading the file only when its mtime changes.
+    
+    Args:
+        token_path: Path to the token file
+    
+    Returns:
+        Parsed token info, or None if the file does not exist
+    """
+    try:
+        mtime = os.stat(token_path).st_mtime
+    except OSError:
+        return None
+    
+    cached = _TOKEN_CACHE.get(token_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[2]
+    
+    with open(token_path, 'rb') as f:
+        raw = f.read()
+    token_info = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+    _TOKEN_CACHE[token_path] = (mtime, raw, token_info)
+    return token_info
+
+
+def _write_token_file(token_path: str, token_json: str):
+    """
+    Atomically save the OAuth token, skipping the write when the file already holds it.
+    
+    Args:
+        token_path: Path to the token file
+        token_json: Serialized credentials (Credentials.to_json())
+    """
+    raw = token_json.encode('utf-8')
+    cached = _TOKEN_CACHE.get(token_path)
+    if cached is not None and cached[1] == raw:
+        return
+    
+    os.makedirs(os.path.dirname(token_path) or '.', exist_ok=True)
+    tmp_path = token_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(raw)
+    os.replace(tmp_path, token_path)
+
+
+def find_overlapping_events(events: List[Dict]) -> List[Tuple[Dict, Dict]]:
+    """
+    Find pairs of timed events whose intervals overlap.
+    
+    Each timestamp is parsed once and the events are swept in start order, so only
+    pairs that actually overlap are compared. All-day and malformed events are skipped.
+    
+    Args:
+        events: Calendar events with RFC3339 start/end dateTime values
+    
+    Returns:
+        List of (earlier_event, later_event) pairs that overlap, ordered by the
+        events' positions in the input list
+    """
+    intervals = []
+    for index, event in enumerate(events):
+        start = (event.get('start') or {}).get('dateTime')
+        end = (event.get('end') or {}).get('dateTime')
+        if not start or not end:
+            continue
+        try:
+            intervals.append((parse_rfc3339(start), parse_rfc3339(end), index))
+        except ValueError:
+            continue
+    
+    intervals.sort(key=lambda interval: interval[0])
+    
+    pairs = []
+    count = len(intervals)
+    for i in range(count):
+        start1, end1, index1 = intervals[i]
+        for j in range(i + 1, count):
+            start2, end2, index2 = intervals[j]
+            if start2 >= end1:
+                # Every later event starts after this one has ended
+                break
+            if end2 > start1:
+                pairs.append((index1, index2) if index1 < index2 else (index2, index1))
+    
+    # Report pairs in the API's order, as the pairwise comparison did
+    pairs.sort()
+    return [(events[i], events[j]) for i, j in pairs]
+
+
+def _iso_sort_key(event: Dict) -> str:
+    """Return an event's raw start string ('dateTime' or all-day 'date') for sorting."""
+    start = event.get('start') or {}
+    return start.get('dateTime') or start.get('date') or ''
+
 
 class CalendarClient:
     """Client for interacting with Google Calendar API."""
@@ -40,18 +215,34 @@ class CalendarClient:
         self.token_path = token_path
         self.service = None
         self.calendar_timezone = None
+        self._credentials = None
+        # Thread that built self.service; only it may use the service's own transport
+        self._service_thread: Optional[int] = None
+        self._thread_local = threading.local()
+        self._executor: Optional[ThreadPoolExecutor] = None
         self._authenticate()
+        self._cal_tz = self._resolve_timezone()
     
     def _authenticate(self):
         """Authenticate and build the Google Calendar service."""
+        global CALENDAR_TIMEZONE
+        
+        # Reuse the service (and primary calendar timezone) built by an earlier client
+        cache_key = (self.credentials_path, self.token_path)
+        cached = _SERVICE_CACHE.get(cache_key)
+        if cached is not None:
+            self.service, self._credentials, self.calendar_timezone, self._service_thread = cached
+            return
+        
         creds = None
         
         # Load existing token if available
-        if os.path.exists(self.token_path):
-            try:
-                creds = Credentials.from_authorized_user_file(self.token_path, SCOPES)
-            except Exception as e:
-                sys.stderr.write(f"Error loading token: {e}\n")
+        try:
+            token_info = _read_token_info(self.token_path)
+            if token_info is not None:
+                creds = Credentials.from_authorized_user_info(token_info, SCOPES)
+        except Exception as e:
+            sys.stderr.write(f"Error loading token: {e}\n")
         
         # If there are no (valid) credentials available, let the user log in
         if not creds or not creds.valid:
@@ -86,29 +277,278 @@ class CalendarClient:
                     sys.stdout.flush()  # Ensure any buffered output is flushed
             
             # Save the credentials for the next run
-            os.makedirs(os.path.dirname(self.token_path), exist_ok=True)
-            with open(self.token_path, 'w') as token:
-                token.write(creds.to_json())
+            _write_token_file(self.token_path, creds.to_json())
         
-        self.service = build('calendar', 'v3', credentials=creds)
+        # The bundled static discovery document is used, so no discovery fetch or file cache
+        self._credentials = creds
+        self.service = build('calendar', 'v3', credentials=creds, cache_discovery=False)
+        self._service_thread = threading.get_ident()
         
         # Get calendar timezone - this is critical for correct date/time queries
         try:
-            calendar = self.service.calendars().get(calendarId='primary').execute()
-            self.calendar_timezone = calendar.get('timeZone', 'UTC')
-            # Set environment variable so query analyzer can use it for time server
-            os.environ['CALENDAR_TIMEZONE'] = self.calendar_timezone
+            cached_timezone = self._read_cached_timezone()
+            if cached_timezone:
+                self.calendar_timezone = cached_timezone
+            else:
+                calendar = self.service.calendars().get(calendarId='primary').execute()
+                self.calendar_timezone = calendar.get('timeZone', 'UTC')
+                self._write_cached_timezone(self.calendar_timezone)
+            # Publish for the query analyzer's time server lookup
+            CALENDAR_TIMEZONE = self.calendar_timezone
+            # Only cache once the timezone is known so a transient failure isn't sticky
+            _SERVICE_CACHE[cache_key] = (self.service, creds, self.calendar_timezone, self._service_thread)
         except Exception as e:
             # Fallback to UTC if we can't get calendar timezone
             self.calendar_timezone = 'UTC'
-            os.environ['CALENDAR_TIMEZONE'] = 'UTC'
+            CALENDAR_TIMEZONE = 'UTC'
+    
+    def _timezone_cache_path(self) -> str:
+        """Path of the calendar metadata file stored next to the OAuth token."""
+        return os.path.join(os.path.dirname(self.token_path), 'calendar_meta.json')
+    
+    def _read_cached_timezone(self) -> Optional[str]:
+        """Return the cached primary calendar timezone, or None if missing or expired."""
+        try:
+            with open(self._timezone_cache_path()) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - meta.get('fetched_at', 0) > TIMEZONE_CACHE_TTL:
+            return None
+        return meta.get('calendar_timezone')
+    
+    def _write_cached_timezone(self, calendar_timezone: str):
+        """Persist the primary calendar timezone so later starts skip calendars.get."""
+        try:
+            with open(self._timezone_cache_path(), 'w') as f:
+                json.dump({'calendar_timezone': calendar_timezone, 'fetched_at': time.time()}, f)
+        except OSError as e:
+            sys.stderr.write(f"Error saving calendar metadata: {e}\n")
+    
+    def _resolve_timezone(self):
+        """Build the tzinfo for the calendar's timezone once, falling back to UTC."""
+        if PYTZ_AVAILABLE and self.calendar_timezone:
+            try:
+                return _tz(self.calendar_timezone)
+            except Exception as e:
+                sys.stderr.write(f"[Calendar Query] Warning: Invalid timezone '{self.calendar_timezone}', using UTC: {e}\n")
+        return UTC
+    
+    def _format_time_bounds(
+        self,
+        time_min: Optional[datetime],
+        time_max: Optional[datetime]
+    ) -> tuple[str, str]:
+        """
+        Convert a query window to RFC3339 strings in the calendar's timezone.
+        
+        Args:
+            time_min: Start time for event query (defaults to now)
+            time_max: End time for event query (defaults to 7 days from time_min)
+        
+        Returns:
+            Tuple of (time_min, time_max) RFC3339 strings
+        """
+        if time_min is None:
+            time_min = datetime.now()
+        if time_max is None:
+            time_max = time_min + timedelta(days=7)
+        
+        # CRITICAL: Use the calendar's actual timezone, not system timezone
+        # This ensures events are queried in the same timezone they're stored
+        return self._to_rfc3339(time_min), self._to_rfc3339(time_max)
+    
+    def _to_rfc3339(self, dt: datetime) -> str:
+        """
+        Format a datetime as RFC3339 in the calendar's timezone.
+        
+        Naive datetimes are assumed to already be in the calendar's timezone.
+        """
+        if dt.tzinfo is None:
+            dt = self._cal_tz.localize(dt) if PYTZ_AVAILABLE else dt.replace(tzinfo=UTC)
+        elif PYTZ_AVAILABLE:
+            dt = dt.astimezone(self._cal_tz)
+        
+        value = dt.isoformat()
+        # Use the Z suffix when the calendar itself is UTC
+        if self._cal_tz is UTC and value.endswith('+00:00'):
+            return value[:-6] + 'Z'
+        return value
+    
+    def _events_request(
+        self,
+        calendar_id: str,
+        time_min_str: str,
+        time_max_str: str,
+        max_results: int,
+        page_token: Optional[str] = None,
+        fields: str = EVENT_FIELDS
+    ):
+        """Build (without executing) an events.list request for one page of at most max_results events."""
+        request_params = {
+            'calendarId': calendar_id,
+            'timeMin': time_min_str,
+            'timeMax': time_max_str,
+            'maxResults': min(max_results, 2500),  # API max is 2500
+            'singleEvents': True,
+            'orderBy': 'startTime',
+            'fields': fields
+        }
+        
+        if page_token:
+            request_params['pageToken'] = page_token
+        
+        return self.service.events().list(**request_params)
+    
+    def _execute_batch(self, calls: Dict[str, object]) -> Dict[str, Optional[Dict]]:
+        """
+        Execute requests through the batch endpoint, BATCH_LIMIT calls per HTTP round-trip.
+        
+        Args:
+            calls: Mapping of request id to an unexecuted API request
+        
+        Returns:
+            Mapping of request id to its response, or None if that call failed
+        """
+        results: Dict[str, Optional[Dict]] = {}
+        
+        def callback(request_id, response, exception):
+            results[request_id] = None if exception is not None else response
+        
+        request_ids = list(calls)
+        for i in range(0, len(request_ids), BATCH_LIMIT):
+            chunk = request_ids[i:i + BATCH_LIMIT]
+            batch = self.service.new_batch_http_request(callback=callback)
+            for request_id in chunk:
+                batch.add(calls[request_id], request_id=request_id)
+            try:
+                batch.execute(http=self._request_http())
+            except Exception as e:
+                # Batch endpoint failed as a whole; issue the calls individually instead
+                sys.stderr.write(f"[Calendar Query] Batch request failed, retrying calls in parallel: {e}\n")
+                results.update(self._execute_parallel({request_id: calls[request_id] for request_id in chunk}))
+        
+        return results
+    
+    def _thread_http(self) -> AuthorizedHttp:
+        """Return this thread's authorized HTTP transport (httplib2.Http is not thread-safe)."""
+        http = getattr(self._thread_local, 'http', None)
+        if http is None:
+            http = AuthorizedHttp(self._credentials, http=httplib2.Http())
+            self._thread_local.http = http
+        return http
+    
+    def _request_http(self) -> Optional[AuthorizedHttp]:
+        """
+        Return the transport for a call made on the current thread.
+        
+        None (use the service's own transport) on the thread that built the service;
+        any other thread, such as the context cache's background refresh, gets its own.
+        """
+        if threading.get_ident() == self._service_thread:
+            return None
+        return self._thread_http()
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the client's worker pool, created on first use and kept so connections stay alive."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="calendar")
+        return self._executor
+    
+    def _execute_parallel(self, calls: Dict[str, object]) -> Dict[str, Optional[Dict]]:
+        """
+        Execute requests concurrently, each worker thread using its own HTTP transport.
+        
+        Args:
+            calls: Mapping of request id to an unexecuted API request
+        
+        Returns:
+            Mapping of request id to its response, or None if that call failed
+        """
+        def execute_one(request_id):
+            try:
+                return request_id, self._execute_raw(calls[request_id], http=self._thread_http())
+            except Exception:
+                return request_id, None
+        
+        # Pool threads outlive the call, so each keeps its keep-alive connection for the next one
+        return dict(self._get_executor().map(execute_one, calls))
+    
+    def _execute_raw(self, request, http=None) -> Dict:
+        """
+        Execute a request over its authorized transport and decode the body directly.
+        
+        Skips googleapiclient's JSON model so large event pages are parsed with orjson.
+        
+        Args:
+            request: Unexecuted API request
+            http: Transport to use (defaults to the current thread's, see _request_http)
+        
+        Returns:
+            Decoded response body
+        
+        Raises:
+            HttpError: If the API returns a non-2xx status
+        """
+        http = http or self._request_http() or request.http
+        resp, content = http.request(
+            request.uri, method=request.method, body=request.body, headers=request.headers
+        )
+        if resp.status >= 300:
+            raise HttpError(resp, content, uri=request.uri)
+        return orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content)
+    
+    def _batch_get_events(
+        self,
+        calendar_ids: List[str],
+        time_min_str: str,
+        time_max_str: str,
+        max_results: int,
+        fields: str = EVENT_FIELDS
+    ) -> Dict[str, List[Dict]]:
+        """
+        Fetch events for several calendars with one batch request per page round.
+        
+        Only calendars whose previous page returned a nextPageToken are re-batched.
+        Calendars whose requests fail are left out of the result.
+        """
+        events_by_calendar: Dict[str, List[Dict]] = {cal_id: [] for cal_id in calendar_ids}
+        page_tokens: Dict[str, Optional[str]] = {cal_id: None for cal_id in calendar_ids}
+        pending = list(calendar_ids) if max_results > 0 else []
+        
+        while pending:
+            responses = self._execute_batch({
+                cal_id: self._events_request(
+                    cal_id, time_min_str, time_max_str,
+                    max_results - len(events_by_calendar[cal_id]), page_tokens[cal_id], fields
+                )
+                for cal_id in pending
+            })
+            
+            next_pending = []
+            for cal_id in pending:
+                response = responses.get(cal_id)
+                if response is None:
+                    # Skip calendars that fail, as the per-calendar loop did
+                    del events_by_calendar[cal_id]
+                    continue
+                
+                events = events_by_calendar[cal_id]
+                events.extend(response.get('items', []))
+                page_tokens[cal_id] = response.get('nextPageToken')
+                if page_tokens[cal_id] and len(events) < max_results:
+                    next_pending.append(cal_id)
+            pending = next_pending
+        
+        return events_by_calendar
     
     def get_events(
         self,
         time_min: Optional[datetime] = None,
         time_max: Optional[datetime] = None,
         max_results: int = 10,
-        calendar_id: str = 'primary'
+        calendar_id: str = 'primary',
+        fields: str = EVENT_FIELDS
     ) -> List[Dict]:
         """
         Fetch events from Google Calendar.
@@ -118,6 +558,7 @@ class CalendarClient:
             time_max: End time for event query (defaults to 7 days from now)
             max_results: Maximum number of events to return
             calendar_id: Calendar ID (defaults to 'primary')
+            fields: Partial-response mask (defaults to EVENT_FIELDS)
         
         Returns:
             List of event dictionaries
@@ -125,88 +566,29 @@ class CalendarClient:
         if not self.service:
             raise RuntimeError("Calendar service not initialized. Authentication required.")
         
-        if time_min is None:
-            time_min = datetime.now()
-        if time_max is None:
-            time_max = time_min + timedelta(days=7)
-        
         try:
-            # Google Calendar API expects RFC3339 format with timezone
-            # CRITICAL: Use the calendar's actual timezone, not system timezone
-            # This ensures events are queried in the same timezone they're stored
-            
-            # Get the calendar's timezone object
-            if PYTZ_AVAILABLE and self.calendar_timezone:
-                try:
-                    cal_tz = pytz.timezone(self.calendar_timezone)
-                except Exception as e:
-                    sys.stderr.write(f"[Calendar Query] Warning: Invalid timezone '{self.calendar_timezone}', using UTC: {e}\n")
-                    cal_tz = pytz.UTC
-            else:
-                # Fallback to UTC if pytz not available
-                cal_tz = pytz.UTC if PYTZ_AVAILABLE else timezone.utc
-            
-            # Convert naive datetimes to calendar timezone
-            # If datetime is naive, assume it's in the calendar's timezone
-            if time_min.tzinfo is None:
-                if PYTZ_AVAILABLE:
-                    time_min = cal_tz.localize(time_min)
-                else:
-                    # Fallback: use UTC offset calculation
-                    time_min = time_min.replace(tzinfo=timezone.utc)
-            else:
-                # If timezone-aware, convert to calendar timezone
-                if PYTZ_AVAILABLE:
-                    time_min = time_min.astimezone(cal_tz)
-            
-            if time_max.tzinfo is None:
-                if PYTZ_AVAILABLE:
-                    time_max = cal_tz.localize(time_max)
-                else:
-                    time_max = time_max.replace(tzinfo=timezone.utc)
-            else:
-                if PYTZ_AVAILABLE:
-                    time_max = time_max.astimezone(cal_tz)
-            
-            # Format as RFC3339 (ISO 8601) with timezone
-            # Google Calendar API expects times in the calendar's timezone
-            time_min_str = time_min.isoformat()
-            time_max_str = time_max.isoformat()
-            
-            # Ensure we have proper timezone format (replace +00:00 with Z only if UTC)
-            if time_min.tzinfo == timezone.utc and time_min_str.endswith('+00:00'):
-                time_min_str = time_min_str.replace('+00:00', 'Z')
-            if time_max.tzinfo == timezone.utc and time_max_str.endswith('+00:00'):
-                time_max_str = time_max_str.replace('+00:00', 'Z')
+            time_min_str, time_max_str = self._format_time_bounds(time_min, time_max)
             
             # Fetch all events with pagination
             events = []
             page_token = None
             
-            while True:
-                request_params = {
-                    'calendarId': calendar_id,
-                    'timeMin': time_min_str,
-                    'timeMax': time_max_str,
-                    'maxResults': min(max_results, 2500),  # API max is 2500
-                    'singleEvents': True,
-                    'orderBy': 'startTime'
-                }
-                
-                if page_token:
-                    request_params['pageToken'] = page_token
-                
-                events_result = self.service.events().list(**request_params).execute()
+            # Stop as soon as the budget is spent; each page asks only for what is left
+            while len(events) < max_results:
+                events_result = self._execute_raw(self._events_request(
+                    calendar_id, time_min_str, time_max_str,
+                    max_results - len(events), page_token, fields
+                ))
                 
                 page_events = events_result.get('items', [])
                 events.extend(page_events)
                 
                 # Check if there are more pages
                 page_token = events_result.get('nextPageToken')
-                if not page_token or len(events) >= max_results:
+                if not page_token:
                     break
             
-            return events[:max_results]  # Return up to max_results
+            return events
         
         except HttpError as error:
             error_details = error.error_details if hasattr(error, 'error_details') else str(error)
@@ -234,10 +616,13 @@ class CalendarClient:
                 raise
             raise RuntimeError(f"Unexpected error while fetching events: {str(e)}")
     
-    def list_calendars(self) -> List[Dict]:
+    def list_calendars(self, fields: Optional[str] = None) -> List[Dict]:
         """
         List all calendars the user has access to.
         
+        Args:
+            fields: Optional partial-response mask, e.g. 'items(id,summary)'
+        
         Returns:
             List of calendar dictionaries with id, summary, and other metadata
         """
@@ -245,7 +630,9 @@ class CalendarClient:
             raise RuntimeError("Calendar service not initialized. Authentication required.")
         
         try:
-            calendar_list = self.service.calendarList().list().execute()
+            calendar_list = self.service.calendarList().list(
+                **({'fields': fields} if fields else {})
+            ).execute(http=self._request_http())
             calendars = calendar_list.get('items', [])
             
             return calendars
@@ -261,7 +648,8 @@ class CalendarClient:
         time_min: Optional[datetime] = None,
         time_max: Optional[datetime] = None,
         max_results: int = 250,
-        calendar_ids: Optional[List[str]] = None
+        calendar_ids: Optional[List[str]] = None,
+        fields: str = EVENT_FIELDS
     ) -> List[Dict]:
         """
         Fetch events from multiple calendars (or all calendars if calendar_ids is None).
@@ -271,6 +659,7 @@ class CalendarClient:
             time_max: End time for event query (defaults to 7 days from now)
             max_results: Maximum number of events per calendar
             calendar_ids: List of calendar IDs to fetch from. If None, fetches from all calendars.
+            fields: Partial-response mask (defaults to EVENT_FIELDS)
         
         Returns:
             List of event dictionaries, each with a 'calendar_name' field added
@@ -278,60 +667,72 @@ class CalendarClient:
         if not self.service:
             raise RuntimeError("Calendar service not initialized. Authentication required.")
         
-        # Get list of calendars if not provided
+        # One calendarList call supplies the names (and the ids if not provided)
         if calendar_ids is None:
-            calendars = self.list_calendars()
+            calendars = self.list_calendars(fields='items(id,summary)')
             calendar_ids = [cal.get('id') for cal in calendars]
-            calendar_names = {cal.get('id'): cal.get('summary', 'Unknown') for cal in calendars}
         else:
-            # Fetch calendar names for provided IDs
-            calendar_names = {}
-            for cal_id in calendar_ids:
-                try:
-                    cal = self.service.calendars().get(calendarId=cal_id).execute()
-                    calendar_names[cal_id] = cal.get('summary', 'Unknown')
-                except Exception:
-                    calendar_names[cal_id] = cal_id
+            try:
+                calendars = self.list_calendars(fields='items(id,summary)')
+            except RuntimeError:
+                # Names are cosmetic; fall back to the ids below
+                calendars = []
+        calendar_names = {cal.get('id'): cal.get('summary', 'Unknown') for cal in calendars}
+        
+        time_min_str, time_max_str = self._format_time_bounds(time_min, time_max)
+        events_by_calendar = self._batch_get_events(
+            calendar_ids, time_min_str, time_max_str, max_results, fields
+        )
         
         all_events = []
         
         for cal_id in calendar_ids:
+            events = events_by_calendar.get(cal_id)
+            if events is None:
+                continue
+            
+            # Add calendar name to each event
             cal_name = calendar_names.get(cal_id, cal_id)
+            for event in events:
+                event['calendar_name'] = cal_name
+                event['calendar_id'] = cal_id
+            
+            all_events.extend(events)
+        
+        # Sort all events by start time. RFC3339 strings sharing one UTC offset order
+        # lexicographically, so only parse when calendars report mixed offsets.
+        offsets = {
+            key[-6:] if key[-1] != 'Z' else '+00:00'
+            for key in map(_iso_sort_key, all_events)
+            if len(key) > 10  # skip all-day dates
+        }
+        if len(offsets) <= 1:
+            all_events.sort(key=_iso_sort_key)
+        else:
             try:
-                events = self.get_events(
-                    time_min=time_min,
-                    time_max=time_max,
-                    max_results=max_results,
-                    calendar_id=cal_id
-                )
-                
-                # Add calendar name to each event
-                for event in events:
-                    event['calendar_name'] = cal_name
-                    event['calendar_id'] = cal_id
-                
-                all_events.extend(events)
-            except Exception as e:
-                # Silently skip calendars that fail
-                continue
-        
-        # Sort all events by start time
-        all_events.sort(key=lambda e: self._get_event_sort_time(e))
+                all_events.sort(key=self._get_event_sort_time)
+            except ValueError:
+                # A malformed timestamp; keep the lexicographic order instead
+                all_events.sort(key=_iso_sort_key)
         
         return all_events
     
     def _get_event_sort_time(self, event: Dict) -> datetime:
-        """Get event datetime for sorting."""
-        start = event.get('start', {}).get('dateTime') or event.get('start', {}).get('date')
-        if start:
-            try:
-                if 'T' in start:
-                    return datetime.fromisoformat(start.replace('Z', '+00:00'))
-                else:
-                    return datetime.fromisoformat(start)
-            except Exception:
-                pass
-        return datetime.min
+        """
+        Get event datetime for sorting.
+        
+        Raises:
+            ValueError: If the event's start is not a valid timestamp
+        """
+        start = _iso_sort_key(event)
+        if not start:
+            return datetime.min.replace(tzinfo=UTC)
+        
+        dt = parse_rfc3339(start)
+        # All-day dates are naive; place them in the calendar timezone so they compare with timed events
+        if dt.tzinfo is None:
+            dt = self._cal_tz.localize(dt) if PYTZ_AVAILABLE else dt.replace(tzinfo=UTC)
+        return dt
     
     def get_events_for_date(self, date: datetime, calendar_id: str = 'primary') -> List[Dict]:
         """
@@ -371,7 +772,7 @@ class CalendarClient:
             calendar_id: Calendar ID (defaults to 'primary')
         
         Returns:
-            Tuple of (is_available, list_of_conflicting_events)
+            Tuple of (is_available, busy intervals as event dicts with summary "Busy")
         
         Raises:
             RuntimeError: If API call fails or invalid time range
@@ -379,35 +780,35 @@ class CalendarClient:
         if start_time >= end_time:
             raise ValueError("start_time must be before end_time")
         
+        if not self.service:
+            raise RuntimeError("Calendar service not initialized. Authentication required.")
+        
+        # Naive bounds are interpreted in the calendar's timezone, as in get_events
+        time_min_str, time_max_str = self._format_time_bounds(start_time, end_time)
+        
         try:
-            events = self.get_events(time_min=start_time, time_max=end_time, max_results=50, calendar_id=calendar_id)
+            response = self.service.freebusy().query(body={
+                'timeMin': time_min_str,
+                'timeMax': time_max_str,
+                'items': [{'id': calendar_id}]
+            }).execute(http=self._request_http())
         except Exception as e:
             raise RuntimeError(f"Error checking availability: {str(e)}")
         
-        conflicts = []
-        for event in events:
-            event_start = event.get('start', {}).get('dateTime') or event.get('start', {}).get('date')
-            event_end = event.get('end', {}).get('dateTime') or event.get('end', {}).get('date')
-            
-            if not event_start:
-                continue
-            
-            try:
-                if 'T' in event_start:
-                    evt_start = datetime.fromisoformat(event_start.replace('Z', '+00:00'))
-                    evt_end = datetime.fromisoformat(event_end.replace('Z', '+00:00'))
-                    
-                    # Check for overlap
-                    if not (evt_end <= start_time or evt_start >= end_time):
-                        conflicts.append(event)
-                else:
-                    # All-day event - conflicts if on the same day
-                    evt_date = datetime.fromisoformat(event_start)
-                    if evt_date.date() == start_time.date():
-                        conflicts.append(event)
-            except (ValueError, KeyError) as e:
-                # Skip events with invalid date formats
-                continue
+        calendar = response.get('calendars', {}).get(calendar_id, {})
+        if calendar.get('errors'):
+            raise RuntimeError(f"Error checking availability: {calendar['errors']}")
+        
+        # freebusy only returns intervals intersecting the window, so every one is a conflict.
+        # Wrap them as minimal events so callers can keep formatting conflicts as events.
+        conflicts = [
+            {
+                'summary': 'Busy',
+                'start': {'dateTime': busy['start']},
+                'end': {'dateTime': busy['end']}
+            }
+            for busy in calendar.get('busy', [])
+        ]
         
         return len(conflicts) == 0, conflicts
     
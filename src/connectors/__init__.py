@@ -3,10 +3,19 @@ Connectors module for Calendar, GitHub, Slack, and JIRA integrations.
 This module provides a clean separation between different service connectors.
 """
 
+from .base import LazyConnector
 from .calendar_connector import CalendarConnector
 from .github_connector import GitHubConnector
 from .slack_connector import SlackConnector
 from .jira_connector import JiraConnector
 
-__all__ = ['CalendarConnector', 'GitHubConnector', 'SlackConnector', 'JiraConnector']
+# Shared connectors; each builds its client on first use
+calendar = CalendarConnector()
+github = GitHubConnector()
+slack = SlackConnector()
+jira = JiraConnector()
 
+__all__ = [
+    'LazyConnector', 'CalendarConnector', 'GitHubConnector', 'SlackConnector', 'JiraConnector',
+    'calendar', 'github', 'slack', 'jira'
+]
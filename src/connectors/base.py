@@ -0,0 +1,89 @@
+"""
+Base connector - lazy, shared construction of a service client.
+"""
+
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+from ..env import load_dotenv
+
+# Load environment variables once for every connector
+load_dotenv()
+
+ClientT = TypeVar("ClientT")
+
+
+class LazyConnector(Generic[ClientT]):
+    """
+    Connector that builds its client on first use.
+    Handles initialization and provides a clean interface.
+    """
+    
+    __slots__ = ("_factory", "_name", "_client", "_init_error", "_lock")
+    
+    def __init__(self, factory: Callable[[], ClientT], name: str):
+        """
+        Initialize the connector.
+        
+        Args:
+            factory: Callable that builds the client
+            name: Service name used in error messages
+        """
+        self._factory = factory
+        self._name = name
+        self._client: Optional[ClientT] = None
+        self._init_error: Optional[Exception] = None
+        self._lock = threading.Lock()
+    
+    def initialize(self) -> ClientT:
+        """
+        Initialize the client.
+        
+        Returns:
+            Client instance
+        
+        Raises:
+            RuntimeError: If initialization fails (the failure is remembered)
+        """
+        client = self._client
+        if client is not None:
+            return client
+        
+        # Build under the lock so concurrent callers share a single factory call
+        with self._lock:
+            if self._client is None and self._init_error is None:
+                try:
+                    self._client = self._factory()
+                except Exception as e:
+                    self._init_error = RuntimeError(f"Failed to initialize {self._name} connector: {e}")
+        
+        if self._init_error is not None:
+            raise self._init_error
+        return self._client
+    
+    @property
+    def client(self) -> ClientT:
+        """
+        Get the client instance.
+        Initializes if not already initialized.
+        
+        Returns:
+            Client instance
+        """
+        return self.initialize()
+    
+    def is_available(self) -> bool:
+        """
+        Check if the connector is available.
+        
+        Returns:
+            True if available, False otherwise
+        """
+        if self._client is not None:
+            return True
+        if self._init_error is not None:
+            return False
+        
+        try:
+            return self.initialize() is not None
+        except Exception:
+            return False
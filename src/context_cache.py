@@ -1,27 +1,68 @@
 """Context caching system for MCP server to reduce API calls and improve performance."""
 
 import time
+import heapq
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
-from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
+from collections import OrderedDict, defaultdict
 
 
 class ContextCache:
     """
     Intelligent caching system for calendar and GitHub data.
     Implements TTL-based caching with smart invalidation.
+    
+    Expiry times of all three caches share one min-heap, so expired entries are
+    swept in O(log N) each instead of being found by scanning the dicts.
+    Each cache is also size-bounded and evicts its least recently used entry.
+    
+    Entries outlive their TTL by stale_while_revalidate_ttl seconds. The plain
+    get_* methods ignore such stale entries, while the *_swr getters return them
+    immediately and refresh the entry on a background thread.
     """
     
     def __init__(self):
         """Initialize the cache."""
-        # Calendar cache: key -> (data, timestamp, ttl)
-        self.calendar_cache: Dict[str, Tuple[Any, float, int]] = {}
+        # Calendar cache: key -> (data, expiry, fresh_until), least recently used first
+        self.calendar_cache: Dict[str, Tuple[Any, float, float]] = OrderedDict()
+        
+        # GitHub cache: key -> (data, expiry, fresh_until), least recently used first
+        self.github_cache: Dict[str, Tuple[Any, float, float]] = OrderedDict()
+        
+        # Query result cache: query_hash -> (context, expiry, fresh_until), least recently used first
+        self.query_cache: Dict[str, Tuple[str, float, float]] = OrderedDict()
+        
+        self._caches: Dict[str, Dict[str, Tuple[Any, float, float]]] = {
+            'calendar': self.calendar_cache,
+            'github': self.github_cache,
+            'query': self.query_cache,
+        }
+        
+        # Maximum entries per cache before the least recently used one is evicted
+        self.max_entries: Dict[str, int] = {
+            'calendar': 512,
+            'github': 2048,
+            'query': 1024,
+        }
+        
+        # Min-heap of (expiry, cache name, key). Entries left behind by an overwrite
+        # are recognised by their expiry no longer matching the stored one.
+        self._expiry_heap: List[Tuple[float, str, str]] = []
         
-        # GitHub cache: key -> (data, timestamp, ttl)
-        self.github_cache: Dict[str, Tuple[Any, float, int]] = {}
+        # Tag -> live (cache name, key) pairs, and the reverse, so invalidating a tag
+        # touches only the entries carrying it
+        self._tags: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
+        self._key_tags: Dict[Tuple[str, str], Tuple[str, ...]] = {}
         
-        # Query result cache: query_hash -> (context, timestamp, ttl)
-        self.query_cache: Dict[str, Tuple[str, float, int]] = {}
+        # Guards the caches against background refreshes running on other threads
+        self._lock = threading.RLock()
+        
+        # (cache name, key) pairs currently being refreshed in the background
+        self._in_flight: Set[Tuple[str, str]] = set()
+        self._refresh_executor: Optional[ThreadPoolExecutor] = None
         
         # Default TTLs (in seconds)
         self.calendar_ttl = 300  # 5 minutes
@@ -30,18 +71,182 @@ class ContextCache:
         self.github_prs_ttl = 300  # 5 minutes
         self.github_deployments_ttl = 600  # 10 minutes
         self.query_ttl = 180  # 3 minutes
+        
+        # How long past its TTL an entry may still be served by the *_swr getters
+        self.stale_while_revalidate_ttl = 300  # 5 minutes
     
     def _get_cache_key(self, prefix: str, **kwargs) -> str:
-        """Generate a cache key from parameters."""
-        key_parts = [prefix]
+        """Generate a fixed-length cache key (128-bit blake2b digest) from parameters."""
+        h = hashlib.blake2b(prefix.encode("utf-8"), digest_size=16)
         for k, v in sorted(kwargs.items()):
             if v is not None:
-                key_parts.append(f"{k}:{v}")
-        return "|".join(key_parts)
+                h.update(b"\x01")
+                h.update(k.encode("utf-8"))
+                h.update(b"\x00")
+                h.update(repr(v).encode("utf-8"))
+        return h.hexdigest()
+    
+    def _query_key(self, query: str) -> str:
+        """Stable 128-bit digest of the normalized query (unlike hash(), same in every process)."""
+        return hashlib.blake2b(query.lower().strip().encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _put(self, cache_name: str, key: str, data: Any, ttl: int, tags: Tuple[str, ...] = ()):
+        """Store an entry, tag it, and schedule its expiry."""
+        now = time.time()
+        fresh_until = now + ttl
+        expiry = fresh_until + self.stale_while_revalidate_ttl
+        
+        with self._lock:
+            cache = self._caches[cache_name]
+            cache[key] = (data, expiry, fresh_until)
+            cache.move_to_end(key)
+            heapq.heappush(self._expiry_heap, (expiry, cache_name, key))
+            self._untag(cache_name, key)
+            if tags:
+                self._key_tags[(cache_name, key)] = tags
+                for tag in tags:
+                    self._tags[tag].add((cache_name, key))
+            
+            if len(cache) > self.max_entries[cache_name]:
+                self._delete(cache_name, next(iter(cache)))
+    
+    def _lookup_entry(self, cache_name: str, key: str) -> Optional[Tuple[Any, bool]]:
+        """Return (data, is_fresh) for a cached entry, or None if missing or past its stale window."""
+        now = time.time()
+        with self._lock:
+            self._sweep(now)
+            cache = self._caches[cache_name]
+            entry = cache.get(key)
+            if entry is None:
+                return None
+            cache.move_to_end(key)
+            return entry[0], now < entry[2]
+    
+    def _lookup(self, cache_name: str, key: str) -> Optional[Any]:
+        """Return a fresh entry's data, or None if missing or expired."""
+        result = self._lookup_entry(cache_name, key)
+        if result is None or not result[1]:
+            return None
+        return result[0]
+    
+    def _get_swr(
+        self,
+        cache_name: str,
+        key: str,
+        ttl: int,
+        fetch: Callable[[], Any],
+        tags: Tuple[str, ...] = ()
+    ) -> Any:
+        """
+        Stale-while-revalidate lookup.
+        
+        Fresh entries are returned as-is. Stale entries are returned immediately while
+        fetch() refreshes them in the background. Misses call fetch() synchronously.
+        """
+        result = self._lookup_entry(cache_name, key)
+        if result is not None:
+            data, is_fresh = result
+            if not is_fresh:
+                self._refresh_in_background(cache_name, key, ttl, fetch, tags)
+            return data
+        
+        data = fetch()
+        self._put(cache_name, key, data, ttl, tags)
+        return data
+    
+    def _refresh_in_background(
+        self,
+        cache_name: str,
+        key: str,
+        ttl: int,
+        fetch: Callable[[], Any],
+        tags: Tuple[str, ...] = ()
+    ):
+        """Refresh one entry on the refresh thread unless a refresh is already running."""
+        with self._lock:
+            if (cache_name, key) in self._in_flight:
+                return
+            self._in_flight.add((cache_name, key))
+            if self._refresh_executor is None:
+                self._refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cache-refresh")
+        
+        def refresh():
+            try:
+                self._put(cache_name, key, fetch(), ttl, tags)
+            except Exception:
+                # Keep serving the stale entry until it expires
+                pass
+            finally:
+                with self._lock:
+                    self._in_flight.discard((cache_name, key))
+        
+        self._refresh_executor.submit(refresh)
+    
+    def _untag(self, cache_name: str, key: str):
+        """Drop an entry from every tag it carries."""
+        for tag in self._key_tags.pop((cache_name, key), ()):
+            tagged = self._tags.get(tag)
+            if tagged is not None:
+                tagged.discard((cache_name, key))
+                if not tagged:
+                    del self._tags[tag]
     
-    def _is_expired(self, timestamp: float, ttl: int) -> bool:
-        """Check if cached data is expired."""
-        return time.time() - timestamp > ttl
+    def _delete(self, cache_name: str, key: str):
+        """Remove an entry and its tags."""
+        del self._caches[cache_name][key]
+        self._untag(cache_name, key)
+    
+    def _github_tags(self, data_type: str, kwargs: Dict[str, Any]) -> Tuple[str, ...]:
+        """Tags for a GitHub entry: its data type plus the user and repo it belongs to."""
+        tags = [f"github:{data_type}"]
+        user = kwargs.get('username') or kwargs.get('owner')
+        if user:
+            tags.append(f"user:{user}")
+        if kwargs.get('repo'):
+            repo = kwargs['repo']
+            tags.append(f"repo:{kwargs['owner']}/{repo}" if kwargs.get('owner') else f"repo:{repo}")
+        return tuple(tags)
+    
+    def _sweep(self, now: float):
+        """Drop every entry whose expiry has passed."""
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expiry, cache_name, key = heapq.heappop(heap)
+            entry = self._caches[cache_name].get(key)
+            if entry is not None and entry[1] == expiry:
+                self._delete(cache_name, key)
+    
+    def _calendar_key(
+        self,
+        time_min: Optional[datetime],
+        time_max: Optional[datetime],
+        calendar_ids: Optional[List[str]]
+    ) -> Tuple[str, Tuple[str, ...]]:
+        """
+        Cache key and tags for a calendar events query.
+        
+        Keys are digests, so the readable query description is kept as a tag
+        for invalidate_calendar_cache patterns to match against.
+        """
+        params = {
+            'time_min': time_min.isoformat() if time_min else None,
+            'time_max': time_max.isoformat() if time_max else None,
+            'calendars': ",".join(sorted(calendar_ids)) if calendar_ids else "all",
+        }
+        label = "|".join(["calendar_events"] + [f"{k}:{v}" for k, v in sorted(params.items()) if v is not None])
+        return self._get_cache_key("calendar_events", **params), ("calendar", label)
+    
+    def _github_ttl(self, data_type: str) -> int:
+        """Default TTL for a GitHub data type."""
+        ttl_map = {
+            'repos': self.github_repos_ttl,
+            'issues': self.github_issues_ttl,
+            'prs': self.github_prs_ttl,
+            'deployments': self.github_deployments_ttl,
+            'commits': self.github_issues_ttl,
+            'user_info': self.github_repos_ttl,
+        }
+        return ttl_map.get(data_type, 300)
     
     def get_calendar_events(
         self,
@@ -60,22 +265,9 @@ class ContextCache:
         Returns:
             Cached events or None if not in cache or expired
         """
-        cache_key = self._get_cache_key(
-            "calendar_events",
-            time_min=time_min.isoformat() if time_min else None,
-            time_max=time_max.isoformat() if time_max else None,
-            calendars=",".join(sorted(calendar_ids)) if calendar_ids else "all"
-        )
-        
-        if cache_key in self.calendar_cache:
-            data, timestamp, ttl = self.calendar_cache[cache_key]
-            if not self._is_expired(timestamp, ttl):
-                return data
-            else:
-                # Remove expired entry
-                del self.calendar_cache[cache_key]
+        cache_key, _ = self._calendar_key(time_min, time_max, calendar_ids)
         
-        return None
+        return self._lookup('calendar', cache_key)
     
     def set_calendar_events(
         self,
@@ -86,18 +278,35 @@ class ContextCache:
         ttl: Optional[int] = None
     ):
         """Cache calendar events."""
-        cache_key = self._get_cache_key(
-            "calendar_events",
-            time_min=time_min.isoformat() if time_min else None,
-            time_max=time_max.isoformat() if time_max else None,
-            calendars=",".join(sorted(calendar_ids)) if calendar_ids else "all"
-        )
+        cache_key, tags = self._calendar_key(time_min, time_max, calendar_ids)
         
-        self.calendar_cache[cache_key] = (
-            events,
-            time.time(),
-            ttl or self.calendar_ttl
-        )
+        self._put('calendar', cache_key, events, ttl or self.calendar_ttl, tags)
+    
+    def get_calendar_events_swr(
+        self,
+        time_min: Optional[datetime],
+        time_max: Optional[datetime],
+        fetch: Callable[[], List[Dict]],
+        calendar_ids: Optional[List[str]] = None,
+        ttl: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Get calendar events, serving stale data while refreshing it in the background.
+        
+        Args:
+            time_min: Start time for query
+            time_max: End time for query
+            fetch: Callable that fetches the events from the API. Stale entries are
+                refreshed by calling it on a refresh thread; CalendarClient methods are
+                safe there because each thread gets its own HTTP transport.
+            calendar_ids: List of calendar IDs (None for all)
+            ttl: Optional TTL override
+        
+        Returns:
+            Cached or freshly fetched events
+        """
+        cache_key, tags = self._calendar_key(time_min, time_max, calendar_ids)
+        return self._get_swr('calendar', cache_key, ttl or self.calendar_ttl, fetch, tags)
     
     def get_github_data(
         self,
@@ -114,26 +323,9 @@ class ContextCache:
         Returns:
             Cached data or None
         """
-        # Determine TTL based on data type
-        ttl_map = {
-            'repos': self.github_repos_ttl,
-            'issues': self.github_issues_ttl,
-            'prs': self.github_prs_ttl,
-            'deployments': self.github_deployments_ttl,
-            'commits': self.github_issues_ttl,  # Same as issues
-            'user_info': self.github_repos_ttl,  # Same as repos
-        }
-        
         cache_key = self._get_cache_key(f"github_{data_type}", **kwargs)
         
-        if cache_key in self.github_cache:
-            data, timestamp, ttl = self.github_cache[cache_key]
-            if not self._is_expired(timestamp, ttl):
-                return data
-            else:
-                del self.github_cache[cache_key]
-        
-        return None
+        return self._lookup('github', cache_key)
     
     def set_github_data(
         self,
@@ -143,60 +335,66 @@ class ContextCache:
         **kwargs
     ):
         """Cache GitHub data."""
-        ttl_map = {
-            'repos': self.github_repos_ttl,
-            'issues': self.github_issues_ttl,
-            'prs': self.github_prs_ttl,
-            'deployments': self.github_deployments_ttl,
-            'commits': self.github_issues_ttl,
-            'user_info': self.github_repos_ttl,
-        }
-        
         cache_key = self._get_cache_key(f"github_{data_type}", **kwargs)
         
-        self.github_cache[cache_key] = (
-            data,
-            time.time(),
-            ttl or ttl_map.get(data_type, 300)
+        self._put('github', cache_key, data, ttl or self._github_ttl(data_type), self._github_tags(data_type, kwargs))
+    
+    def get_github_data_swr(
+        self,
+        data_type: str,
+        fetch: Callable[[], Any],
+        ttl: Optional[int] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Get GitHub data, serving stale data while refreshing it in the background.
+        
+        Args:
+            data_type: Type of data ('repos', 'issues', 'prs', 'deployments', 'commits')
+            fetch: Callable that fetches the data from the API
+            ttl: Optional TTL override
+            **kwargs: Additional parameters for cache key
+        
+        Returns:
+            Cached or freshly fetched data
+        """
+        cache_key = self._get_cache_key(f"github_{data_type}", **kwargs)
+        return self._get_swr(
+            'github', cache_key, ttl or self._github_ttl(data_type), fetch, self._github_tags(data_type, kwargs)
         )
     
     def get_query_result(self, query: str) -> Optional[str]:
         """Get cached query result."""
-        # Simple hash of query (could be improved)
-        query_hash = str(hash(query.lower().strip()))
-        
-        if query_hash in self.query_cache:
-            context, timestamp, ttl = self.query_cache[query_hash]
-            if not self._is_expired(timestamp, ttl):
-                return context
-            else:
-                del self.query_cache[query_hash]
+        query_hash = self._query_key(query)
         
-        return None
+        return self._lookup('query', query_hash)
     
     def set_query_result(self, query: str, context: str, ttl: Optional[int] = None):
         """Cache query result."""
-        query_hash = str(hash(query.lower().strip()))
+        query_hash = self._query_key(query)
         
-        self.query_cache[query_hash] = (
-            context,
-            time.time(),
-            ttl or self.query_ttl
-        )
+        self._put('query', query_hash, context, ttl or self.query_ttl)
     
     def invalidate_calendar_cache(self, pattern: Optional[str] = None):
         """
         Invalidate calendar cache.
         
         Args:
-            pattern: Optional pattern to match cache keys (None = invalidate all)
+            pattern: Optional pattern to match calendar queries (None = invalidate all)
         """
         if pattern is None:
-            self.calendar_cache.clear()
-        else:
-            keys_to_remove = [k for k in self.calendar_cache.keys() if pattern in k]
+            self.invalidate_tag("calendar")
+            return
+        
+        # Free-form substring patterns still need a scan of the calendar query descriptions
+        with self._lock:
+            self._sweep(time.time())
+            keys_to_remove = [
+                k for k in self.calendar_cache
+                if any(pattern in tag for tag in self._key_tags.get(('calendar', k), ()))
+            ]
             for key in keys_to_remove:
-                del self.calendar_cache[key]
+                self._delete('calendar', key)
     
     def invalidate_github_cache(self, data_type: Optional[str] = None):
         """
@@ -206,18 +404,32 @@ class ContextCache:
             data_type: Optional data type to invalidate (None = invalidate all)
         """
         if data_type is None:
-            self.github_cache.clear()
+            with self._lock:
+                for key in list(self.github_cache):
+                    self._delete('github', key)
         else:
-            prefix = f"github_{data_type}"
-            keys_to_remove = [k for k in self.github_cache.keys() if k.startswith(prefix)]
-            for key in keys_to_remove:
-                del self.github_cache[key]
+            self.invalidate_tag(f"github:{data_type}")
+    
+    def invalidate_tag(self, tag: str):
+        """
+        Invalidate every cached entry carrying a tag.
+        
+        Args:
+            tag: 'calendar', 'github:<data_type>', 'user:<login>' or 'repo:<owner>/<repo>'
+        """
+        with self._lock:
+            for cache_name, key in list(self._tags.get(tag, ())):
+                self._delete(cache_name, key)
     
     def clear_all(self):
         """Clear all caches."""
-        self.calendar_cache.clear()
-        self.github_cache.clear()
-        self.query_cache.clear()
+        with self._lock:
+            self.calendar_cache.clear()
+            self.github_cache.clear()
+            self.query_cache.clear()
+            self._tags.clear()
+            self._key_tags.clear()
+            self._expiry_heap.clear()
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
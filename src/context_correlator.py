@@ -1,10 +1,56 @@
 """Multi-source context correlation engine for linking calendar and GitHub data."""
 
 import re
+import functools
+import itertools
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from collections import defaultdict
 
+# Entity patterns used by extract_entities
+_RE_OWNER_REPO = re.compile(r'([a-zA-Z0-9_-]+)/([a-zA-Z0-9_-]+)')  # owner/repo
+_RE_PROJECT = re.compile(r'\b([A-Z][a-zA-Z0-9_-]{3,})\b')  # Capitalized words (project names)
+_RE_NAME = re.compile(r'\b([A-Z][a-z]+)\s+([A-Z][a-z]+)\b')  # "First Last"
+
+# Shortest text any entity pattern can match (an owner/repo such as "a/b")
+_MIN_ENTITY_TEXT_LEN = 3
+
+# Upper bound on event_repo_links kept per correlation; format_correlations shows the first 5
+MAX_EVENT_REPO_LINKS = 50
+
+
+@dataclass(slots=True)
+class EventRepoLink:
+    """A calendar event linked to a mentioned repo (repo set) or project (project set)."""
+    event: str
+    event_time: str
+    repo: Optional[str] = None
+    project: Optional[str] = None
+    related_issues: int = 0
+    related_prs: int = 0
+    open_issues: List[Dict] = field(default_factory=list)
+    open_prs: List[Dict] = field(default_factory=list)
+    matching_repos: List[str] = field(default_factory=list)
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_entities(text: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Extract (repos, projects, people) from text, memoized per text.
+    
+    Tuples keep the cached result immutable; callers get fresh lists from extract_entities.
+    """
+    # Extract potential repo names (owner/repo format) and project names
+    repos = tuple(f"{owner}/{repo}" for owner, repo in _RE_OWNER_REPO.findall(text))
+    projects = tuple(_RE_PROJECT.findall(text))
+    
+    # Extract people names (capitalized words that might be names)
+    # This is a simple heuristic - could be improved
+    people = tuple(f"{first} {last}" for first, last in _RE_NAME.findall(text))
+    
+    return repos, projects, people
+
 
 class ContextCorrelator:
     """
@@ -26,41 +72,24 @@ class ContextCorrelator:
         Returns:
             Dictionary with entity types and values
         """
-        entities = {
-            'repos': [],
-            'projects': [],
-            'people': []
-        }
-        
-        # Extract potential repo names (words with hyphens/underscores, or owner/repo format)
-        repo_patterns = [
-            r'([a-zA-Z0-9_-]+)/([a-zA-Z0-9_-]+)',  # owner/repo
-            r'\b([A-Z][a-zA-Z0-9_-]{3,})\b',  # Capitalized words (project names)
-        ]
-        
-        for pattern in repo_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                if isinstance(matches[0], tuple):
-                    # owner/repo format
-                    entities['repos'].extend([f"{m[0]}/{m[1]}" for m in matches])
-                else:
-                    entities['projects'].extend(matches)
+        # Blank or very short text (e.g. an event with no description) can't match anything
+        if not text or len(text) < _MIN_ENTITY_TEXT_LEN or text.isspace():
+            return {'repos': [], 'projects': [], 'people': []}
         
-        # Extract people names (capitalized words that might be names)
-        # This is a simple heuristic - could be improved
-        name_pattern = r'\b([A-Z][a-z]+)\s+([A-Z][a-z]+)\b'
-        name_matches = re.findall(name_pattern, text)
-        entities['people'] = [f"{m[0]} {m[1]}" for m in name_matches]
-        
-        return entities
+        repos, projects, people = _extract_entities(text)
+        return {
+            'repos': list(repos),
+            'projects': list(projects),
+            'people': list(people)
+        }
     
     def correlate_calendar_github(
         self,
         calendar_events: List[Dict],
         github_repos: List[Dict],
         github_issues: List[Dict],
-        github_prs: List[Dict]
+        github_prs: List[Dict],
+        now: Optional[datetime] = None
     ) -> Dict[str, Any]:
         """
         Correlate calendar events with GitHub activity.
@@ -70,6 +99,7 @@ class ContextCorrelator:
             github_repos: List of GitHub repositories
             github_issues: List of GitHub issues
             github_prs: List of GitHub pull requests
+            now: Reference time for upcoming/recent checks (None = current local time)
         
         Returns:
             Dictionary with correlations and insights
@@ -80,99 +110,129 @@ class ContextCorrelator:
             'insights': []
         }
         
-        # Create repo name mapping
+        # Index repos, issues and PRs by lowercased name once so each event does dict lookups
         repo_names = {}
+        repo_search = []  # (name, description, full_name), lowercased for project matching
         for repo in github_repos:
             full_name = repo.get('full_name', '')
             name = repo.get('name', '')
             repo_names[full_name.lower()] = repo
             repo_names[name.lower()] = repo
+            repo_search.append((name.lower(), (repo.get('description') or '').lower(), repo.get('full_name')))
+        
+        issues_by_repo = defaultdict(list)
+        for issue in github_issues:
+            # repository_url ends in /repos/{owner}/{repo}
+            owner_repo = "/".join((issue.get('repository_url') or '').lower().rstrip('/').rsplit('/', 2)[-2:])
+            issues_by_repo[owner_repo].append(issue)
+        
+        prs_by_repo = defaultdict(list)
+        for pr in github_prs:
+            # head.repo is null for PRs from deleted forks
+            full_name = ((pr.get('head') or {}).get('repo') or {}).get('full_name') or ''
+            prs_by_repo[full_name.lower()].append(pr)
+        
+        # Single pass over the events: links, upcoming mentions and recent count together,
+        # all classified against one snapshot of the current time
+        if now is None:
+            now = datetime.now()
+        links = correlations['event_repo_links']
+        upcoming_mentions = []  # (event, mentioned repos) for the first 5 upcoming events
+        recent_count = 0
+        has_busy_period = False
         
-        # Analyze calendar events for repo/project mentions
         for event in calendar_events:
             event_text = f"{event.get('summary', '')} {event.get('description', '')}"
             entities = self.extract_entities(event_text)
+            start_dt, end_dt = self._parse_times(event)
             
-            # Find matching repos
-            for repo_name in entities['repos']:
-                if repo_name.lower() in repo_names:
-                    repo = repo_names[repo_name.lower()]
-                    # Find related issues/PRs
-                    related_issues = [
-                        issue for issue in github_issues
-                        if repo_name.lower() in issue.get('repository_url', '').lower()
-                    ]
-                    related_prs = [
-                        pr for pr in github_prs
-                        if repo_name.lower() in pr.get('head', {}).get('repo', {}).get('full_name', '').lower()
-                    ]
-                    
-                    correlations['event_repo_links'].append({
-                        'event': event.get('summary', ''),
-                        'event_time': event.get('start', {}).get('dateTime', ''),
-                        'repo': repo_name,
-                        'related_issues': len(related_issues),
-                        'related_prs': len(related_prs),
-                        'open_issues': related_issues[:3],
-                        'open_prs': related_prs[:3]
-                    })
+            # Stop building link dicts once enough have been found
+            if len(links) < MAX_EVENT_REPO_LINKS:
+                links.extend(itertools.islice(
+                    self._iter_event_links(event, entities, repo_names, repo_search, issues_by_repo, prs_by_repo),
+                    MAX_EVENT_REPO_LINKS - len(links)
+                ))
             
-            # Check for project names
-            for project in entities['projects']:
-                # Try to match with repo names
-                matching_repos = [
-                    repo for repo in github_repos
-                    if project.lower() in repo.get('name', '').lower() or
-                       project.lower() in repo.get('description', '').lower()
-                ]
-                
-                if matching_repos:
-                    correlations['event_repo_links'].append({
-                        'event': event.get('summary', ''),
-                        'event_time': event.get('start', {}).get('dateTime', ''),
-                        'project': project,
-                        'matching_repos': [r.get('full_name') for r in matching_repos]
-                    })
+            if self._is_upcoming(start_dt, now):
+                if len(upcoming_mentions) < 5:
+                    upcoming_mentions.append((event, entities['repos']))
+                if end_dt is not None:
+                    has_busy_period = True
+            elif self._is_recent(start_dt, now):
+                recent_count += 1
         
         # Generate suggestions
         correlations['suggestions'] = self._generate_suggestions(
-            calendar_events, github_repos, github_issues, github_prs
+            upcoming_mentions, has_busy_period, github_prs, prs_by_repo
         )
         
         # Generate insights
         correlations['insights'] = self._generate_insights(
-            calendar_events, github_repos, github_issues, github_prs
+            recent_count, github_repos, github_issues, github_prs
         )
         
         return correlations
     
+    def _iter_event_links(
+        self,
+        event: Dict,
+        entities: Dict[str, List[str]],
+        repo_names: Dict[str, Dict],
+        repo_search: List[Tuple[str, str, str]],
+        issues_by_repo: Dict[str, List[Dict]],
+        prs_by_repo: Dict[str, List[Dict]]
+    ) -> Iterator[EventRepoLink]:
+        """Yield a link for each repo or project mentioned in a calendar event."""
+        # Find matching repos
+        for repo_name in entities['repos']:
+            repo_key = repo_name.lower()
+            if repo_key in repo_names:
+                # Find related issues/PRs
+                related_issues = issues_by_repo.get(repo_key, [])
+                related_prs = prs_by_repo.get(repo_key, [])
+                
+                yield EventRepoLink(
+                    event=event.get('summary', ''),
+                    event_time=(event.get('start') or {}).get('dateTime', ''),
+                    repo=repo_name,
+                    related_issues=len(related_issues),
+                    related_prs=len(related_prs),
+                    open_issues=related_issues[:3],
+                    open_prs=related_prs[:3]
+                )
+        
+        # Check for project names
+        for project in entities['projects']:
+            # Try to match with repo names
+            project_key = project.lower()
+            matching_repos = [
+                full_name for name, description, full_name in repo_search
+                if project_key in name or project_key in description
+            ]
+            
+            if matching_repos:
+                yield EventRepoLink(
+                    event=event.get('summary', ''),
+                    event_time=(event.get('start') or {}).get('dateTime', ''),
+                    project=project,
+                    matching_repos=matching_repos
+                )
+    
     def _generate_suggestions(
         self,
-        events: List[Dict],
-        repos: List[Dict],
-        issues: List[Dict],
-        prs: List[Dict]
+        upcoming_mentions: List[Tuple[Dict, List[str]]],
+        has_busy_period: bool,
+        prs: List[Dict],
+        prs_by_repo: Dict[str, List[Dict]]
     ) -> List[str]:
-        """Generate proactive suggestions based on correlated data."""
+        """Generate proactive suggestions from the state gathered in the correlation pass."""
         suggestions = []
         
         # Check for upcoming meetings with related GitHub activity
-        now = datetime.now()
-        upcoming_events = [
-            e for e in events
-            if self._is_upcoming(e, now)
-        ]
-        
-        for event in upcoming_events[:5]:  # Check top 5 upcoming events
-            event_text = f"{event.get('summary', '')} {event.get('description', '')}"
-            entities = self.extract_entities(event_text)
-            
+        for event, repo_mentions in upcoming_mentions:
             # If event mentions a repo/project, check for related activity
-            for repo_name in entities['repos']:
-                related_prs = [
-                    pr for pr in prs
-                    if repo_name.lower() in pr.get('head', {}).get('repo', {}).get('full_name', '').lower()
-                ]
+            for repo_name in repo_mentions:
+                related_prs = prs_by_repo.get(repo_name.lower(), [])
                 
                 if related_prs:
                     suggestions.append(
@@ -183,35 +243,30 @@ class ContextCorrelator:
         # Check for PRs ready to merge when user has free time
         if prs:
             open_prs_count = len([pr for pr in prs if pr.get('state') == 'open'])
-            if open_prs_count > 0:
-                # Check if user has free time soon
-                busy_times = self._get_busy_periods(events, now)
-                if not busy_times:
-                    suggestions.append(
-                        f"You have {open_prs_count} open PR(s) and appear to have free time. "
-                        "Consider reviewing them."
-                    )
+            if open_prs_count > 0 and not has_busy_period:
+                suggestions.append(
+                    f"You have {open_prs_count} open PR(s) and appear to have free time. "
+                    "Consider reviewing them."
+                )
         
         return suggestions
     
     def _generate_insights(
         self,
-        events: List[Dict],
+        recent_count: int,
         repos: List[Dict],
         issues: List[Dict],
         prs: List[Dict]
     ) -> List[str]:
-        """Generate insights from correlated data."""
+        """Generate insights from the state gathered in the correlation pass."""
         insights = []
         
         # Activity correlation
-        if events and repos:
-            recent_events = [e for e in events if self._is_recent(e, datetime.now())]
-            if recent_events:
-                insights.append(
-                    f"You have {len(recent_events)} recent calendar event(s) and "
-                    f"{len(repos)} active repository/ies. Consider linking meeting notes to GitHub issues."
-                )
+        if recent_count and repos:
+            insights.append(
+                f"You have {recent_count} recent calendar event(s) and "
+                f"{len(repos)} active repository/ies. Consider linking meeting notes to GitHub issues."
+            )
         
         # Workload insights
         total_issues = len(issues)
@@ -224,58 +279,46 @@ class ContextCorrelator:
         
         return insights
     
-    def _is_upcoming(self, event: Dict, now: datetime) -> bool:
-        """Check if event is in the future."""
-        start = event.get('start', {}).get('dateTime') or event.get('start', {}).get('date')
-        if not start:
-            return False
-        
+    def _parse_event_time(self, value: Optional[str]) -> Optional[datetime]:
+        """Parse an event 'dateTime' or all-day 'date' as a naive datetime (None if missing or invalid)."""
+        if not value:
+            return None
         try:
-            if 'T' in start:
-                event_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-            else:
-                event_dt = datetime.fromisoformat(start)
-            
-            return event_dt.replace(tzinfo=None) > now
-        except:
-            return False
+            if value.endswith('Z'):
+                # UTC wall-clock time; the offset is dropped anyway
+                return datetime.fromisoformat(value[:-1])
+            return datetime.fromisoformat(value).replace(tzinfo=None)
+        except (ValueError, TypeError, AttributeError):
+            # Malformed or non-string value
+            return None
     
-    def _is_recent(self, event: Dict, now: datetime, days: int = 7) -> bool:
-        """Check if event is recent (within N days)."""
-        start = event.get('start', {}).get('dateTime') or event.get('start', {}).get('date')
-        if not start:
-            return False
-        
-        try:
-            if 'T' in start:
-                event_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-            else:
-                event_dt = datetime.fromisoformat(start)
-            
-            days_diff = (now - event_dt.replace(tzinfo=None)).days
-            return 0 <= days_diff <= days
-        except:
-            return False
-    
-    def _get_busy_periods(self, events: List[Dict], now: datetime) -> List[Tuple[datetime, datetime]]:
-        """Get list of busy time periods from events."""
-        busy_periods = []
+    def _parse_times(self, event: Dict) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """
+        Parse an event's start and end.
         
-        for event in events:
-            start = event.get('start', {}).get('dateTime')
-            end = event.get('end', {}).get('dateTime')
-            
-            if start and end:
-                try:
-                    start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                    end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
-                    
-                    if start_dt.replace(tzinfo=None) > now:
-                        busy_periods.append((start_dt.replace(tzinfo=None), end_dt.replace(tzinfo=None)))
-                except:
-                    pass
+        Args:
+            event: Calendar event
         
-        return busy_periods
+        Returns:
+            (start, end) where start covers timed and all-day events and end is only
+            set when both start and end are timed
+        """
+        start = event.get('start') or {}
+        end_dt = None
+        if start.get('dateTime'):
+            end_dt = self._parse_event_time((event.get('end') or {}).get('dateTime'))
+        return self._parse_event_time(start.get('dateTime') or start.get('date')), end_dt
+    
+    def _is_upcoming(self, start_dt: Optional[datetime], now: datetime) -> bool:
+        """Check if an event starting at start_dt is in the future."""
+        return start_dt is not None and start_dt > now
+    
+    def _is_recent(self, start_dt: Optional[datetime], now: datetime, days: int = 7) -> bool:
+        """Check if an event starting at start_dt is recent (within N days)."""
+        if start_dt is None:
+            return False
+        days_diff = (now - start_dt).days
+        return 0 <= days_diff <= days
     
     def format_correlations(self, correlations: Dict[str, Any]) -> str:
         """
@@ -295,15 +338,15 @@ class ContextCorrelator:
             parts.append("-" * 50)
             
             for link in correlations['event_repo_links'][:5]:  # Limit to 5
-                event_name = link.get('event', 'Unknown Event')
-                repo_name = link.get('repo') or link.get('project', 'Unknown')
+                event_name = link.event
+                repo_name = link.repo or link.project or 'Unknown'
                 
                 correlation_line = f"  • {event_name} → {repo_name}"
                 
-                if link.get('related_issues', 0) > 0:
-                    correlation_line += f" ({link.get('related_issues')} open issues)"
-                if link.get('related_prs', 0) > 0:
-                    correlation_line += f" ({link.get('related_prs')} open PRs)"
+                if link.related_issues > 0:
+                    correlation_line += f" ({link.related_issues} open issues)"
+                if link.related_prs > 0:
+                    correlation_line += f" ({link.related_prs} open PRs)"
                 
                 parts.append(correlation_line)
             
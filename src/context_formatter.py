@@ -1,8 +1,50 @@
 """Context formatter for structuring calendar data into AI-friendly context."""
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
-from .utils import format_event_time
+import functools
+import itertools
+from dataclasses import dataclass
+from operator import itemgetter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from .utils import format_event_time, get_event_start
+
+
+# Rule under each day heading
+_SEPARATOR = "-" * 50
+
+
+@functools.lru_cache(maxsize=512)
+def _fmt_day(day: date) -> str:
+    """Long-form day heading, e.g. 'Monday, January 05, 2026' (cached; strftime is pure)."""
+    return day.strftime('%A, %B %d, %Y')
+
+
+def _truncate(text: str, limit: int = 100) -> str:
+    """Cut text to limit characters, marking the cut with '...' (empty or None passes through)."""
+    return text[:limit] + "..." if text and len(text) > limit else text
+
+
+@dataclass(slots=True)
+class _EventView:
+    """The fields the schedule layouts read from an event, extracted once."""
+    summary: str
+    start_dt: datetime
+    time_str: str
+    location: str
+    description: str  # already truncated to 100 characters
+    calendar_name: str
+    
+    @classmethod
+    def from_event(cls, event: Dict, start_dt: datetime) -> "_EventView":
+        """Build a view of a calendar event whose start has already been parsed."""
+        return cls(
+            summary=event.get('summary', 'Untitled Event'),
+            start_dt=start_dt,
+            time_str=format_event_time(event, start_dt),
+            location=event.get('location', ''),
+            description=_truncate(event.get('description', '')),
+            calendar_name=event.get('calendar_name', '')
+        )
 
 
 class ContextFormatter:
@@ -47,46 +89,41 @@ class ContextFormatter:
         target_date = analysis.get('target_date')
         time_ref = analysis.get('time')
         
-        context_parts = []
-        
+        # Fixed shape: header, event details, verdict - built directly rather than joined
         if target_date:
-            date_str = target_date.strftime('%A, %B %d, %Y')
-            context_parts.append(f"User's calendar for {date_str}:")
+            header = f"User's calendar for {_fmt_day(target_date)}:"
         else:
-            context_parts.append("User's calendar:")
+            header = "User's calendar:"
         
         if conflicts:
-            conflict_details = []
-            for event in conflicts:
-                title = event.get('summary', 'Untitled Event')
-                time_str = format_event_time(event)
-                conflict_details.append(f"'{title}' ({time_str})")
-            
-            context_parts.append(f"Conflicting events: {', '.join(conflict_details)}")
+            conflict_details = ", ".join(
+                f"'{event.get('summary', 'Untitled Event')}' ({format_event_time(event)})"
+                for event in conflicts
+            )
+            body = f"Conflicting events: {conflict_details}"
             
             if availability is False:
-                context_parts.append("User is NOT free at the requested time.")
+                verdict = "User is NOT free at the requested time."
             else:
-                context_parts.append("User has conflicting events.")
+                verdict = "User has conflicting events."
         elif events:
-            event_details = []
-            for event in events[:5]:  # Limit to 5 events
-                title = event.get('summary', 'Untitled Event')
-                time_str = format_event_time(event)
-                event_details.append(f"'{title}' ({time_str})")
-            
-            context_parts.append(f"Events: {', '.join(event_details)}")
+            event_details = ", ".join(
+                f"'{event.get('summary', 'Untitled Event')}' ({format_event_time(event)})"
+                for event in events[:5]  # Limit to 5 events
+            )
+            body = f"Events: {event_details}"
             
             if availability is True:
-                context_parts.append("User is free at the requested time.")
+                verdict = "User is free at the requested time."
             else:
-                context_parts.append("User has events scheduled.")
+                verdict = "User has events scheduled."
         else:
-            context_parts.append("No events found.")
+            body = "No events found."
             if availability is True:
-                context_parts.append("User is free.")
+                return f"{header} {body} User is free."
+            return f"{header} {body}"
         
-        return " ".join(context_parts)
+        return f"{header} {body} {verdict}"
     
     def _format_conflict_context(
         self,
@@ -97,38 +134,30 @@ class ContextFormatter:
         """Format context for conflict detection queries."""
         target_date = analysis.get('target_date')
         
-        context_parts = []
-        
         if target_date:
-            date_str = target_date.strftime('%A, %B %d, %Y')
-            context_parts.append(f"Conflict check for {date_str}:")
+            header = f"Conflict check for {_fmt_day(target_date)}:"
         else:
-            context_parts.append("Conflict check:")
+            header = "Conflict check:"
         
         if conflicts:
-            conflict_details = []
-            for event in conflicts:
-                title = event.get('summary', 'Untitled Event')
-                time_str = format_event_time(event)
-                conflict_details.append(f"'{title}' ({time_str})")
-            
-            context_parts.append(f"Found {len(conflicts)} conflict(s): {', '.join(conflict_details)}")
-        else:
-            context_parts.append("No conflicts detected.")
-            
-            if events:
-                event_count = len(events)
-                context_parts.append(f"You have {event_count} event(s) scheduled:")
-                event_list = []
-                for event in events[:10]:
-                    title = event.get('summary', 'Untitled Event')
-                    time_str = format_event_time(event)
-                    calendar_name = event.get('calendar_name', '')
-                    cal_info = f" [{calendar_name}]" if calendar_name else ""
-                    event_list.append(f"'{title}' ({time_str}){cal_info}")
-                context_parts.append("; ".join(event_list))
+            conflict_details = ", ".join(
+                f"'{event.get('summary', 'Untitled Event')}' ({format_event_time(event)})"
+                for event in conflicts
+            )
+            return f"{header} Found {len(conflicts)} conflict(s): {conflict_details}"
+        
+        if not events:
+            return f"{header} No conflicts detected."
+        
+        event_list = []
+        for event in events[:10]:
+            title = event.get('summary', 'Untitled Event')
+            time_str = format_event_time(event)
+            calendar_name = event.get('calendar_name', '')
+            cal_info = f" [{calendar_name}]" if calendar_name else ""
+            event_list.append(f"'{title}' ({time_str}){cal_info}")
         
-        return " ".join(context_parts)
+        return f"{header} No conflicts detected. You have {len(events)} event(s) scheduled: {'; '.join(event_list)}"
     
     def _format_schedule_summary(
         self,
@@ -145,7 +174,7 @@ class ContextFormatter:
         
         # Add clear header with date range
         if target_date:
-            date_str = target_date.strftime('%A, %B %d, %Y')
+            date_str = _fmt_day(target_date)
             context_parts.append(f"SCHEDULE FOR: {date_str}\n")
         elif is_this_week:
             context_parts.append("SCHEDULE FOR: THIS WEEK\n")
@@ -160,73 +189,61 @@ class ContextFormatter:
             context_parts.append("No events scheduled for this period.")
             return "\n".join(context_parts)
         
-        # Group events by date with detailed formatting
-        events_by_date = {}
-        for event in events:
-            start = event.get('start', {})
-            event_time = start.get('dateTime') or start.get('date')
-            
-            if event_time:
-                try:
-                    if 'T' in event_time:
-                        event_dt = datetime.fromisoformat(event_time.replace('Z', '+00:00'))
-                    else:
-                        event_dt = datetime.fromisoformat(event_time)
-                    
-                    date_key = event_dt.date()
-                    if date_key not in events_by_date:
-                        events_by_date[date_key] = []
-                    events_by_date[date_key].append(event)
-                except Exception:
-                    continue
-        
-        # Format by date with clear structure
-        for date_key in sorted(events_by_date.keys()):
-            date_events = events_by_date[date_key]
-            date_str = date_key.strftime('%A, %B %d, %Y')
-            context_parts.append(f"\n{date_str}:")
-            context_parts.append("-" * 50)
-            
-            # Sort events by time
-            sorted_events = sorted(date_events, key=lambda e: self._get_event_datetime(e))
-            
-            for i, event in enumerate(sorted_events, 1):
-                title = event.get('summary', 'Untitled Event')
-                time_str = format_event_time(event)
-                location = event.get('location', '')
-                description = event.get('description', '')
-                calendar_name = event.get('calendar_name', '')
-                
-                event_line = f"  {i}. {title} - {time_str}"
-                if calendar_name:
-                    event_line += f" [Calendar: {calendar_name}]"
-                if location:
-                    event_line += f" | Location: {location}"
-                if description:
-                    desc_short = description[:100] + "..." if len(description) > 100 else description
-                    event_line += f" | Notes: {desc_short}"
-                
-                context_parts.append(event_line)
+        # Format by date with clear structure, events sorted by time within each day
+        for date_key, sorted_events in self._events_by_day(events):
+            context_parts.append(self._format_day_section(date_key, sorted_events))
         
         context_parts.append(f"\nTOTAL EVENTS: {len(events)}")
         
         return "\n".join(context_parts)
     
-    def _get_event_datetime(self, event: Dict) -> datetime:
-        """Get event datetime for sorting."""
-        start = event.get('start', {})
-        event_time = start.get('dateTime') or start.get('date')
+    def _format_day_section(self, day: date, sorted_events: List[_EventView]) -> str:
+        """Format one day of a schedule: heading, rule and numbered event lines as a single string."""
+        event_lines = "\n".join(
+            self._format_event_line(i, event) for i, event in enumerate(sorted_events, 1)
+        )
+        return f"\n{_fmt_day(day)}:\n{_SEPARATOR}\n{event_lines}"
+    
+    def _format_event_line(self, i: int, event: _EventView) -> str:
+        """Format one numbered event line of a schedule, with its optional details."""
+        calendar_name = event.calendar_name
+        location = event.location
+        description = event.description
+        
+        # One f-string instead of repeated += on the line
+        return (
+            f"  {i}. {event.summary} - {event.time_str}"
+            f"{f' [Calendar: {calendar_name}]' if calendar_name else ''}"
+            f"{f' | Location: {location}' if location else ''}"
+            f"{f' | Notes: {description}' if description else ''}"
+        )
+    
+    def _events_by_day(self, events: List[Dict]) -> Iterator[Tuple[date, List[_EventView]]]:
+        """
+        Group events by the date of their start, skipping unparseable ones.
+        
+        Each event is converted once into an _EventView. The (date, start, view)
+        rows are sorted once and streamed per day with groupby.
         
-        if event_time:
-            try:
-                if 'T' in event_time:
-                    return datetime.fromisoformat(event_time.replace('Z', '+00:00'))
-                else:
-                    return datetime.fromisoformat(event_time)
-            except Exception:
-                pass
+        Returns:
+            Iterator of (date, views of that day's events sorted by start time), in date order
+        """
+        rows = []
+        for event in events:
+            event_dt = get_event_start(event)
+            if event_dt is not None:
+                rows.append((event_dt.date(), event_dt, _EventView.from_event(event, event_dt)))
+        
+        # Sort on (date, start) only; views themselves aren't comparable
+        rows.sort(key=itemgetter(0, 1))
+        
+        # Common case: everything is on one day (sorted, so first == last), no grouping needed
+        if rows and rows[0][0] == rows[-1][0]:
+            yield rows[0][0], [view for _, _, view in rows]
+            return
         
-        return datetime.min
+        for day, day_rows in itertools.groupby(rows, key=itemgetter(0)):
+            yield day, [view for _, _, view in day_rows]
     
     def _format_general_context(
         self,
@@ -239,53 +256,9 @@ class ContextFormatter:
         
         context_parts = [f"CALENDAR EVENTS ({len(events)} total):\n"]
         
-        # Group by date for better organization
-        events_by_date = {}
-        for event in events:
-            start = event.get('start', {})
-            event_time = start.get('dateTime') or start.get('date')
-            
-            if event_time:
-                try:
-                    if 'T' in event_time:
-                        event_dt = datetime.fromisoformat(event_time.replace('Z', '+00:00'))
-                    else:
-                        event_dt = datetime.fromisoformat(event_time)
-                    
-                    date_key = event_dt.date()
-                    if date_key not in events_by_date:
-                        events_by_date[date_key] = []
-                    events_by_date[date_key].append(event)
-                except Exception:
-                    continue
-        
-        # Format by date
-        for date_key in sorted(events_by_date.keys()):
-            date_events = events_by_date[date_key]
-            date_str = date_key.strftime('%A, %B %d, %Y')
-            context_parts.append(f"\n{date_str}:")
-            context_parts.append("-" * 50)
-            
-            # Sort by time
-            sorted_events = sorted(date_events, key=lambda e: self._get_event_datetime(e))
-            
-            for i, event in enumerate(sorted_events, 1):
-                title = event.get('summary', 'Untitled Event')
-                time_str = format_event_time(event)
-                location = event.get('location', '')
-                description = event.get('description', '')
-                calendar_name = event.get('calendar_name', '')
-                
-                event_line = f"  {i}. {title} - {time_str}"
-                if calendar_name:
-                    event_line += f" [Calendar: {calendar_name}]"
-                if location:
-                    event_line += f" | Location: {location}"
-                if description:
-                    desc_short = description[:100] + "..." if len(description) > 100 else description
-                    event_line += f" | Notes: {desc_short}"
-                
-                context_parts.append(event_line)
+        # Group by date for better organization, sorted by time within each day
+        for date_key, sorted_events in self._events_by_day(events):
+            context_parts.append(self._format_day_section(date_key, sorted_events))
         
         return "\n".join(context_parts)
     
@@ -311,8 +284,7 @@ class ContextFormatter:
         
         if description:
             # Truncate long descriptions
-            desc = description[:100] + "..." if len(description) > 100 else description
-            parts.append(f"Description: {desc}")
+            parts.append(f"Description: {_truncate(description)}")
         
         return " | ".join(parts)
 
@@ -1,8 +1,76 @@
 """Context ranking and relevance scoring for prioritizing context items."""
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
+import heapq
 import re
+from .utils import get_event_start
+
+# Importance keywords boosting an event (substring match on title + description)
+_IMPORTANT_EVENT_RE = re.compile(r'meeting|standup|review|deadline|urgent')
+
+# Label names boosting a GitHub issue/PR (exact match on the lowercased name)
+_IMPORTANT_LABELS = frozenset(['urgent', 'critical', 'bug', 'blocker', 'priority'])
+
+# Score contributions are collected as bit flags and mapped to a final score through
+# tables precomputed at import time. Recency levels take two bits.
+_TITLE_MATCH = 1
+_BODY_MATCH = 2
+_RECENCY_SHIFT = 2
+_IMPORTANT = 16
+_OPEN_STATE = 32
+
+_RECENT_TODAY = 1 << _RECENCY_SHIFT
+_RECENT_TOMORROW = 2 << _RECENCY_SHIFT
+_RECENT_WEEK = 3 << _RECENCY_SHIFT
+
+
+def _event_score(flags: int) -> float:
+    """Relevance score of an event with the given contribution flags."""
+    score = 0.0
+    if flags & _TITLE_MATCH:
+        score += 0.3
+    if flags & _BODY_MATCH:
+        score += 0.2
+    recency = flags >> _RECENCY_SHIFT & 3
+    if recency:
+        score += (0.3, 0.2, 0.1)[recency - 1]
+    if flags & _IMPORTANT:
+        score += 0.1
+    return min(score, 1.0)
+
+
+def _github_score(flags: int) -> float:
+    """Relevance score of a GitHub item with the given contribution flags."""
+    score = 0.0
+    if flags & _TITLE_MATCH:
+        score += 0.4
+    if flags & _BODY_MATCH:
+        score += 0.2
+    if flags & _OPEN_STATE:
+        score += 0.2
+    recency = flags >> _RECENCY_SHIFT & 3
+    if recency == 1:
+        score += 0.2
+    elif recency == 3:
+        score += 0.1
+    if flags & _IMPORTANT:
+        score += 0.1
+    return min(score, 1.0)
+
+
+_EVENT_SCORES = tuple(_event_score(flags) for flags in range(32))
+_GITHUB_SCORES = tuple(_github_score(flags) for flags in range(64))
+
+
+def _lowered(item: Dict, *keys: str) -> str:
+    """First non-empty item[key] lowercased ('' if none)."""
+    value = ''
+    for key in keys:
+        value = item.get(key)
+        if value:
+            break
+    return (value or '').lower()
 
 
 class ContextRanker:
@@ -35,10 +103,18 @@ class ContextRanker:
         if not events:
             return []
         
-        # Score each event
+        # Score each event against the query words and clock, both read once
+        qwords = self._query_words(query)
+        now = datetime.now()
+        
+        # Only the top N are needed: select them without sorting everything
+        # (nlargest is stable, like the sort below)
+        if max_items and 0 < max_items < len(events):
+            return heapq.nlargest(max_items, events, key=lambda event: self._score_event(event, qwords, now))
+        
         scored_events = []
         for event in events:
-            score = self._score_event(event, query)
+            score = self._score_event(event, qwords, now)
             scored_events.append((score, event))
         
         # Sort by score (highest first)
@@ -72,10 +148,17 @@ class ContextRanker:
         if not items:
             return []
         
-        # Score each item
+        # Score each item against the query words and clock, both read once
+        qwords = self._query_words(query)
+        now = datetime.now()
+        
+        # Only the top N are needed: select them without sorting everything
+        if max_items and 0 < max_items < len(items):
+            return heapq.nlargest(max_items, items, key=lambda item: self._score_github_item(item, item_type, qwords, now))
+        
         scored_items = []
         for item in items:
-            score = self._score_github_item(item, item_type, query)
+            score = self._score_github_item(item, item_type, qwords, now)
             scored_items.append((score, item))
         
         # Sort by score
@@ -87,106 +170,119 @@ class ContextRanker:
         else:
             return [item for _, item in scored_items]
     
-    def _score_event(self, event: Dict, query: str) -> float:
+    def _query_words(self, query: str) -> FrozenSet[str]:
+        """Lowercased query words long enough to be meaningful (more than 3 characters)."""
+        return frozenset(word for word in query.lower().split() if len(word) > 3)
+    
+    def _score_event(self, event: Dict, qwords: FrozenSet[str], now: datetime) -> float:
         """
         Score an event's relevance to the query.
         
+        Args:
+            event: Calendar event
+            qwords: Query words from _query_words
+            now: Current local time for the recency boost
+        
         Returns:
             Relevance score (0.0 to 1.0)
         """
-        score = 0.0
-        query_lower = query.lower()
-        
-        # Check title match
-        title = event.get('summary', '').lower()
-        if any(word in title for word in query_lower.split() if len(word) > 3):
-            score += 0.3
-        
-        # Check description match
-        description = (event.get('description', '') or '').lower()
-        if any(word in description for word in query_lower.split() if len(word) > 3):
-            score += 0.2
+        flags = 0
+        
+        # Lowercased once for both the query match and the importance keywords
+        title = _lowered(event, 'summary')
+        description = _lowered(event, 'description')
+        
+        # Query matches (skipped when the query has no meaningful words)
+        if qwords:
+            # Check title match
+            if any(word in title for word in qwords):
+                flags |= _TITLE_MATCH
+            
+            # Check description match
+            if any(word in description for word in qwords):
+                flags |= _BODY_MATCH
         
         # Recency boost (events closer to now get higher score)
-        start = event.get('start', {}).get('dateTime') or event.get('start', {}).get('date')
-        if start:
-            try:
-                if 'T' in start:
-                    event_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                else:
-                    event_dt = datetime.fromisoformat(start)
-                
-                now = datetime.now()
-                days_diff = abs((event_dt.replace(tzinfo=None) - now).days)
-                
-                # Boost for events today/tomorrow
-                if days_diff == 0:
-                    score += 0.3
-                elif days_diff == 1:
-                    score += 0.2
-                elif days_diff <= 7:
-                    score += 0.1
-            except:
-                pass
+        event_dt = get_event_start(event)
+        if event_dt is not None:
+            days_diff = abs((event_dt.replace(tzinfo=None) - now).days)
+            
+            # Boost for events today/tomorrow
+            if days_diff == 0:
+                flags |= _RECENT_TODAY
+            elif days_diff == 1:
+                flags |= _RECENT_TOMORROW
+            elif days_diff <= 7:
+                flags |= _RECENT_WEEK
         
         # Importance keywords boost
-        important_keywords = ['meeting', 'standup', 'review', 'deadline', 'urgent']
-        event_text = f"{title} {description}"
-        if any(keyword in event_text for keyword in important_keywords):
-            score += 0.1
+        if _IMPORTANT_EVENT_RE.search(title) or _IMPORTANT_EVENT_RE.search(description):
+            flags |= _IMPORTANT
         
-        # Normalize to 0-1 range
-        return min(score, 1.0)
+        # Normalized to 0-1 range by the table
+        return _EVENT_SCORES[flags]
     
-    def _score_github_item(self, item: Dict, item_type: str, query: str) -> float:
+    def _score_github_item(self, item: Dict, item_type: str, qwords: FrozenSet[str], now: datetime) -> float:
         """
         Score a GitHub item's relevance to the query.
         
+        Args:
+            item: GitHub item
+            item_type: Type of item ('issue', 'pr', 'repo', 'deployment')
+            qwords: Query words from _query_words
+            now: Current local time for the recency boost
+        
         Returns:
             Relevance score (0.0 to 1.0)
         """
-        score = 0.0
-        query_lower = query.lower()
+        flags = 0
+        
+        # Query matches (skipped when the query has no meaningful words)
+        if qwords:
+            # Title match
+            title = _lowered(item, 'title')
+            if any(word in title for word in qwords):
+                flags |= _TITLE_MATCH
+            
+            # Body/description match
+            body = _lowered(item, 'body', 'description')
+            if any(word in body for word in qwords):
+                flags |= _BODY_MATCH
         
-        # Title match
-        title = (item.get('title', '') or '').lower()
-        if any(word in title for word in query_lower.split() if len(word) > 3):
-            score += 0.4
-        
-        # Body/description match
-        body = (item.get('body', '') or item.get('description', '') or '').lower()
-        if any(word in body for word in query_lower.split() if len(word) > 3):
-            score += 0.2
+        # Recency boost
+        updated_dt = self._updated_time(item)
+        if updated_dt is not None:
+            days_ago = (now - updated_dt).days
+            
+            if days_ago == 0:
+                flags |= _RECENT_TODAY
+            elif days_ago <= 7:
+                flags |= _RECENT_WEEK
         
         # State boost (open items are usually more relevant)
         if item.get('state') == 'open':
-            score += 0.2
-        
-        # Recency boost
-        updated = item.get('updated_at') or item.get('created_at', '')
-        if updated:
-            try:
-                updated_dt = datetime.fromisoformat(updated.replace('Z', '+00:00'))
-                days_ago = (datetime.now() - updated_dt.replace(tzinfo=None)).days
-                
-                if days_ago == 0:
-                    score += 0.2
-                elif days_ago <= 7:
-                    score += 0.1
-            except:
-                pass
+            flags |= _OPEN_STATE
         
         # Labels boost (for issues/PRs)
         labels = item.get('labels', [])
         if labels:
-            label_names = [l.get('name', '').lower() for l in labels if isinstance(l, dict)]
             # Boost for important labels
-            important_labels = ['urgent', 'critical', 'bug', 'blocker', 'priority']
-            if any(label in important_labels for label in label_names):
-                score += 0.1
+            if any(l.get('name', '').lower() in _IMPORTANT_LABELS for l in labels if isinstance(l, dict)):
+                flags |= _IMPORTANT
         
-        # Normalize
-        return min(score, 1.0)
+        # Normalized by the table
+        return _GITHUB_SCORES[flags]
+    
+    def _updated_time(self, item: Dict) -> Optional[datetime]:
+        """Naive last-update (or creation) time of a GitHub item, or None if missing or unparseable."""
+        updated = item.get('updated_at') or item.get('created_at', '')
+        if not updated:
+            return None
+        try:
+            return datetime.fromisoformat(updated.replace('Z', '+00:00')).replace(tzinfo=None)
+        except (ValueError, TypeError, AttributeError):
+            # Malformed or non-string value
+            return None
     
     def rank_context_sections(
         self,
@@ -205,8 +301,12 @@ class ContextRanker:
         """
         scored_sections = []
         
+        # Tokenize the query once for all sections
+        all_words = query.lower().split()
+        query_words = [w for w in all_words if len(w) > 3]
+        
         for section_name, content in context_sections.items():
-            score = self._score_section(section_name, content, query)
+            score = self._score_section(section_name, content, all_words, query_words)
             scored_sections.append((section_name, content, score))
         
         # Sort by score
@@ -214,18 +314,17 @@ class ContextRanker:
         
         return scored_sections
     
-    def _score_section(self, section_name: str, content: str, query: str) -> float:
-        """Score a context section's relevance."""
+    def _score_section(self, section_name: str, content: str, all_words: List[str], query_words: List[str]) -> float:
+        """Score a context section's relevance (all_words: every query word; query_words: those over 3 chars)."""
         score = 0.0
-        query_lower = query.lower()
         
         # Section name match
-        if any(word in section_name.lower() for word in query_lower.split()):
+        section_lower = section_name.lower()
+        if any(word in section_lower for word in all_words):
             score += 0.5
         
         # Content match
         content_lower = content.lower()
-        query_words = [w for w in query_lower.split() if len(w) > 3]
         matches = sum(1 for word in query_words if word in content_lower)
         if matches > 0:
             score += min(0.3 * (matches / len(query_words)), 0.3)
@@ -1,9 +1,51 @@
 """Context summarization and compression for efficient AI context delivery."""
 
+import heapq
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from operator import itemgetter
+from typing import Dict, List, Optional, Set, Tuple
 import re
 
+from .utils import get_event_start
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Lines containing any of these (case-insensitive) are kept first when compressing
+_IMPORTANT_KEYWORDS = frozenset((
+    'error', 'conflict', 'urgent', 'important', 'blocking',
+    'today', 'tomorrow', 'now', 'deadline'
+))
+# Fallback matcher when pyahocorasick is not installed (substring, not word, match).
+# Run on lowercased text: re.IGNORECASE is several times slower on long input
+_KEYWORD_RE = re.compile('|'.join(sorted(_IMPORTANT_KEYWORDS)))
+
+# Rough estimate: 1 token ≈ 3 characters (closer to real BPE ratios than 4)
+_CHARS_PER_TOKEN = 3
+
+
+def _clip(text: str, limit: int) -> str:
+    """Cut text to at most limit characters, marking a cut with a single '…'."""
+    return text if len(text) <= limit else text[:limit - 1] + '…'
+
+
+def _top_n(keyed: List[Tuple], n: int) -> List:
+    """
+    Return the items of the n (key, item) pairs with the largest keys.
+    
+    Keys are extracted up front so comparisons run through itemgetter in C.
+    Equivalent to sorted(reverse=True)[:n]: nlargest is stable, so ties keep
+    input order as the sort does.
+    """
+    if 0 < n < len(keyed):
+        top = heapq.nlargest(n, keyed, key=itemgetter(0))
+    else:
+        top = sorted(keyed, key=itemgetter(0), reverse=True)[:n]
+    return [item for _, item in top]
+
 
 class ContextSummarizer:
     """
@@ -11,6 +53,9 @@ class ContextSummarizer:
     while maintaining essential information.
     """
     
+    # Keyword automaton shared by all instances, built on first use
+    _kw_automaton = None
+    
     def __init__(self, max_tokens: int = 2000):
         """
         Initialize the summarizer.
@@ -19,8 +64,6 @@ class ContextSummarizer:
             max_tokens: Maximum tokens for summarized context
         """
         self.max_tokens = max_tokens
-        # Rough estimate: 1 token ≈ 4 characters
-        self.chars_per_token = 4
     
     def summarize_events(
         self,
@@ -44,26 +87,34 @@ class ContextSummarizer:
         
         # Auto-determine max_items if not specified
         if max_items is None:
-            # Estimate: each event ~100 chars = ~25 tokens
-            max_items = min(len(events), self.max_tokens // 25)
+            # Estimate: each event ~100 chars = ~33 tokens
+            max_items = min(len(events), self.max_tokens // (100 // _CHARS_PER_TOKEN))
         
-        # Sort by priority
+        # Sort by priority. Each event's key is computed once and decorated
+        # with its index so ties keep input order and events are never compared
         if priority == "time":
             # Sort by start time (upcoming first)
-            sorted_events = sorted(
-                events,
-                key=lambda e: self._get_event_datetime(e)
-            )
+            decorated = [
+                (self._get_event_datetime(e), i, e) for i, e in enumerate(events)
+            ]
         elif priority == "recent":
-            # Most recent first
+            # Most recent first (largest distance from now sorts first)
             now = datetime.now()
-            sorted_events = sorted(
-                events,
-                key=lambda e: abs((self._get_event_datetime(e) - now).total_seconds()),
-                reverse=True
-            )
+            decorated = [
+                (-abs((self._get_event_datetime(e) - now).total_seconds()), i, e)
+                for i, e in enumerate(events)
+            ]
         else:
+            decorated = None
+        
+        if decorated is None:
             sorted_events = events
+        elif 0 < max_items < len(decorated):
+            # Only the first N are needed: select them without sorting everything
+            sorted_events = [e for _, _, e in heapq.nsmallest(max_items, decorated)]
+        else:
+            decorated.sort()
+            sorted_events = [e for _, _, e in decorated]
         
         # Take top N and simplify
         summarized = []
@@ -128,42 +179,41 @@ class ContextSummarizer:
             Compressed context
         """
         if target_length is None:
-            target_length = self.max_tokens * self.chars_per_token
+            target_length = self.max_tokens * _CHARS_PER_TOKEN
         
         if len(context) <= target_length:
             return context
         
-        # Split into lines and prioritize
-        lines = context.split('\n')
-        important_lines = []
-        less_important = []
-        
-        for line in lines:
-            # Prioritize lines with key information
-            if any(keyword in line.lower() for keyword in [
-                'error', 'conflict', 'urgent', 'important', 'blocking',
-                'today', 'tomorrow', 'now', 'deadline'
-            ]):
-                important_lines.append(line)
-            else:
-                less_important.append(line)
-        
-        # Build compressed version
+        # Single pass: keep important lines as they come (up to 70% of the
+        # budget) and defer the rest until we know how much space is left
         compressed = []
         current_length = 0
+        deferred = []
+        deferred_length = 0
         
-        # Add important lines first
-        for line in important_lines:
-            if current_length + len(line) <= target_length * 0.7:  # Reserve 70% for important
-                compressed.append(line)
-                current_length += len(line)
+        important_budget = target_length * 0.7  # Reserve 70% for important
+        
+        # Prioritize lines with key information
+        keyword_lines = self._keyword_line_numbers(context)
+        
+        for line_no, line in enumerate(context.split('\n')):
+            line_length = len(line)
+            if line_no in keyword_lines:
+                if current_length + line_length <= important_budget:
+                    compressed.append(line)
+                    current_length += line_length
+            elif deferred_length <= target_length:
+                # Past the full budget no further deferred line can fit
+                deferred.append(line)
+                deferred_length += line_length
         
         # Add less important lines if space allows
         remaining = target_length - current_length
-        for line in less_important:
-            if len(line) <= remaining:
+        for line in deferred:
+            line_length = len(line)
+            if line_length <= remaining:
                 compressed.append(line)
-                remaining -= len(line)
+                remaining -= line_length
             else:
                 break
         
@@ -175,6 +225,78 @@ class ContextSummarizer:
         
         return result
     
+    @classmethod
+    def _get_kw_automaton(cls):
+        """Build the Aho-Corasick keyword automaton once per process."""
+        if cls._kw_automaton is None:
+            automaton = ahocorasick.Automaton()
+            for keyword in _IMPORTANT_KEYWORDS:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            cls._kw_automaton = automaton
+        return cls._kw_automaton
+    
+    def _is_important_line(self, line: str) -> bool:
+        """Check whether a line mentions any important keyword."""
+        text = line if line.islower() else line.lower()
+        if AHOCORASICK_AVAILABLE:
+            return next(self._get_kw_automaton().iter(text), None) is not None
+        return _KEYWORD_RE.search(text) is not None
+    
+    def _keyword_line_numbers(self, context: str) -> Set[int]:
+        """
+        Find the lines of a context string that mention an important keyword.
+        
+        The whole lowercased string is scanned by the matcher in C, and Python
+        only steps in per match to map it to its line, so keyword-free lines
+        cost nothing beyond the scan.
+        
+        Args:
+            context: Full context string
+        
+        Returns:
+            Indices (in context.split('\n')) of the matching lines
+        """
+        text = context.lower()
+        if len(text) != len(context):
+            # Lowercasing shifted offsets (e.g. 'İ'), so check line by line
+            return {
+                line_no for line_no, line in enumerate(context.split('\n'))
+                if self._is_important_line(line)
+            }
+        
+        line_numbers = set()
+        line_no = 0
+        pos = 0  # Start of line number line_no
+        
+        if AHOCORASICK_AVAILABLE:
+            line_end = -1
+            for end, keyword in self._get_kw_automaton().iter(text):
+                if end < line_end:
+                    continue  # Another keyword on a line already counted
+                start = end - len(keyword) + 1
+                line_no += text.count('\n', pos, start)
+                line_numbers.add(line_no)
+                line_end = text.find('\n', start)
+                if line_end < 0:
+                    break
+                pos = line_end + 1
+                line_no += 1
+        else:
+            while True:
+                match = _KEYWORD_RE.search(text, pos)
+                if match is None:
+                    break
+                line_no += text.count('\n', pos, match.start())
+                line_numbers.add(line_no)
+                line_end = text.find('\n', match.start())
+                if line_end < 0:
+                    break
+                pos = line_end + 1
+                line_no += 1
+        
+        return line_numbers
+    
     def _simplify_event(self, event: Dict) -> Dict:
         """Simplify an event dictionary, removing unnecessary fields."""
         simplified = {
@@ -184,31 +306,28 @@ class ContextSummarizer:
         }
         
         # Only include location if present
-        if event.get('location'):
-            simplified['location'] = event.get('location')
+        location = event.get('location')
+        if location:
+            simplified['location'] = location
         
         # Truncate description
-        if event.get('description'):
-            desc = event.get('description', '')
-            simplified['description'] = desc[:200] + "..." if len(desc) > 200 else desc
+        desc = event.get('description')
+        if desc:
+            simplified['description'] = _clip(desc, 200)
         
         return simplified
     
     def _summarize_repos(self, repos: List[Dict], max_count: int = 10) -> List[Dict]:
         """Summarize repository list."""
         # Sort by updated date (most recent first)
-        sorted_repos = sorted(
-            repos,
-            key=lambda r: r.get('updated_at', ''),
-            reverse=True
-        )
+        sorted_repos = _top_n([(r.get('updated_at', ''), r) for r in repos], max_count)
         
         # Simplify each repo
         summarized = []
-        for repo in sorted_repos[:max_count]:
+        for repo in sorted_repos:
             simplified = {
                 'full_name': repo.get('full_name', ''),
-                'description': (repo.get('description', '') or '')[:100],
+                'description': _clip(repo.get('description') or '', 100),
                 'stargazers_count': repo.get('stargazers_count', 0),
                 'language': repo.get('language', 'N/A')
             }
@@ -219,17 +338,13 @@ class ContextSummarizer:
     def _summarize_issues(self, issues: List[Dict], max_count: int = 10) -> List[Dict]:
         """Summarize issues list."""
         # Sort by number (most recent first, typically)
-        sorted_issues = sorted(
-            issues,
-            key=lambda i: i.get('number', 0),
-            reverse=True
-        )
+        sorted_issues = _top_n([(i.get('number', 0), i) for i in issues], max_count)
         
         summarized = []
-        for issue in sorted_issues[:max_count]:
+        for issue in sorted_issues:
             simplified = {
                 'number': issue.get('number'),
-                'title': issue.get('title', '')[:100],
+                'title': _clip(issue.get('title', ''), 100),
                 'state': issue.get('state', 'open')
             }
             summarized.append(simplified)
@@ -239,17 +354,13 @@ class ContextSummarizer:
     def _summarize_prs(self, prs: List[Dict], max_count: int = 10) -> List[Dict]:
         """Summarize pull requests list."""
         # Sort by number
-        sorted_prs = sorted(
-            prs,
-            key=lambda p: p.get('number', 0),
-            reverse=True
-        )
+        sorted_prs = _top_n([(p.get('number', 0), p) for p in prs], max_count)
         
         summarized = []
-        for pr in sorted_prs[:max_count]:
+        for pr in sorted_prs:
             simplified = {
                 'number': pr.get('number'),
-                'title': pr.get('title', '')[:100],
+                'title': _clip(pr.get('title', ''), 100),
                 'state': pr.get('state', 'open')
             }
             summarized.append(simplified)
@@ -259,14 +370,10 @@ class ContextSummarizer:
     def _summarize_deployments(self, deployments: List[Dict], max_count: int = 10) -> List[Dict]:
         """Summarize deployments list."""
         # Sort by created date
-        sorted_deployments = sorted(
-            deployments,
-            key=lambda d: d.get('created_at', ''),
-            reverse=True
-        )
+        sorted_deployments = _top_n([(d.get('created_at', ''), d) for d in deployments], max_count)
         
         summarized = []
-        for deployment in sorted_deployments[:max_count]:
+        for deployment in sorted_deployments:
             simplified = {
                 'id': deployment.get('id'),
                 'environment': deployment.get('environment', ''),
@@ -279,17 +386,5 @@ class ContextSummarizer:
     
     def _get_event_datetime(self, event: Dict) -> datetime:
         """Get event datetime for sorting."""
-        start = event.get('start', {})
-        event_time = start.get('dateTime') or start.get('date')
-        
-        if event_time:
-            try:
-                if 'T' in event_time:
-                    return datetime.fromisoformat(event_time.replace('Z', '+00:00'))
-                else:
-                    return datetime.fromisoformat(event_time)
-            except:
-                pass
-        
-        return datetime.min
-
+        start_dt = get_event_start(event)
+        return datetime.min if start_dt is None else start_dt
@@ -0,0 +1,57 @@
+"""Minimal .env loader used in place of python-dotenv."""
+
+import os
+import re
+from pathlib import Path
+from typing import Dict, Set
+
+# The .env file lives at the project root, next to the src/ package
+ENV_PATH = Path(__file__).resolve().parent.parent / ".env"
+
+# [export ]KEY=VALUE per line, following python-dotenv: values may be wrapped in
+# matching single or double quotes, and a trailing "# comment" is dropped (after a
+# closing quote, or after whitespace for unquoted values).
+# Comment lines never match because keys must start with a letter or underscore.
+_ENV_RE = re.compile(
+    r'^[ \t]*(?:export[ \t]+)?([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*'
+    r'(?:"([^"\n]*)"[ \t]*(?:#[^\n]*)?|\'([^\'\n]*)\'[ \t]*(?:#[^\n]*)?|(.*?)(?:[ \t]+#[^\n]*)?)[ \t\r]*$',
+    re.MULTILINE
+)
+
+# Files already loaded into os.environ; every module calls load_dotenv() at import
+_LOADED: Set[Path] = set()
+
+
+def read_dotenv(path: Path = ENV_PATH) -> Dict[str, str]:
+    """
+    Parse a .env file into a dictionary.
+    
+    Args:
+        path: Path to the .env file (defaults to the project root .env)
+    
+    Returns:
+        Mapping of variable names to values (empty if the file is missing)
+    """
+    path = Path(path)
+    if not path.exists():
+        return {}
+    text = path.read_text(encoding="utf-8")
+    return {m[1]: m[m.lastindex] for m in _ENV_RE.finditer(text)}
+
+
+def load_dotenv(path: Path = ENV_PATH) -> None:
+    """
+    Load KEY=VALUE pairs from a .env file into os.environ.
+    
+    Variables already set in the environment take precedence over the file.
+    Each file is only read once per process.
+    
+    Args:
+        path: Path to the .env file (defaults to the project root .env)
+    """
+    path = Path(path).resolve()
+    if path in _LOADED:
+        return
+    _LOADED.add(path)
+    for k, v in read_dotenv(path).items():
+        os.environ.setdefault(k, v)
@@ -2,7 +2,7 @@
 
 import os
 from typing import Optional, List, Dict
-from dotenv import load_dotenv
+from .env import load_dotenv
 
 # Load environment variables
 load_dotenv()
@@ -6,7 +6,7 @@ import base64
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 from urllib.parse import quote
-from dotenv import load_dotenv
+from .env import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
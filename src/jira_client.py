@@ -3,7 +3,7 @@
 import os
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
-from dotenv import load_dotenv
+from .env import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 from .utils import parse_date_reference, parse_time_reference
+from .calendar_client import get_calendar_timezone
 
 
 class QueryIntent(Enum):
@@ -28,7 +29,7 @@ class QueryAnalyzer:
         """
         Get the current date and time.
         First tries to fetch from a time server if enabled, otherwise uses system time.
-        Uses calendar timezone if available via environment variable.
+        Uses the calendar client's timezone if one has authenticated.
         
         Returns:
             Current datetime (naive, will be converted to calendar timezone later)
@@ -36,8 +37,8 @@ class QueryAnalyzer:
         # Check if time server is enabled via environment variable
         use_time_server = os.getenv("USE_TIME_SERVER", "true").lower() == "true"
         
-        # Get timezone from environment (set by calendar client) or default to CST
-        calendar_tz = os.getenv("CALENDAR_TIMEZONE", "America/Chicago")
+        # Get timezone from the calendar client (or CALENDAR_TIMEZONE) or default to CST
+        calendar_tz = get_calendar_timezone("America/Chicago")
         
         if use_time_server:
             try:
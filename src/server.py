@@ -7,7 +7,8 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dotenv import load_dotenv
+from functools import partial
+from .env import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
@@ -27,7 +28,7 @@ except ImportError:
             "MCP SDK not found. Please install it with: pip install mcp"
         )
 
-from .calendar_client import CalendarClient
+from .calendar_client import CalendarClient, find_overlapping_events
 from .query_analyzer import QueryAnalyzer, QueryIntent
 from .context_formatter import ContextFormatter
 from .utils import format_event_time
@@ -385,33 +386,7 @@ def detect_conflicts(date: str) -> str:
         events = calendar_client.get_events_for_date(target_date)
         
         # Check for overlapping events
-        conflicts = []
-        for i, event1 in enumerate(events):
-            start1 = event1.get('start', {}).get('dateTime') or event1.get('start', {}).get('date')
-            end1 = event1.get('end', {}).get('dateTime') or event1.get('end', {}).get('date')
-            
-            if not start1 or 'T' not in start1:
-                continue
-            
-            try:
-                dt_start1 = datetime.fromisoformat(start1.replace('Z', '+00:00'))
-                dt_end1 = datetime.fromisoformat(end1.replace('Z', '+00:00'))
-                
-                for j, event2 in enumerate(events[i+1:], i+1):
-                    start2 = event2.get('start', {}).get('dateTime') or event2.get('start', {}).get('date')
-                    end2 = event2.get('end', {}).get('dateTime') or event2.get('end', {}).get('date')
-                    
-                    if not start2 or 'T' not in start2:
-                        continue
-                    
-                    dt_start2 = datetime.fromisoformat(start2.replace('Z', '+00:00'))
-                    dt_end2 = datetime.fromisoformat(end2.replace('Z', '+00:00'))
-                    
-                    # Check for overlap
-                    if not (dt_end1 <= dt_start2 or dt_start1 >= dt_end2):
-                        conflicts.append((event1, event2))
-            except Exception:
-                continue
+        conflicts = find_overlapping_events(events)
         
         # Format response
         date_str = target_date.strftime('%A, %B %d, %Y')
@@ -1072,18 +1047,17 @@ def chat(message: str, include_calendar_context: bool = True, include_github_con
                 
                 time_min, time_max = query_analyzer.get_time_range_for_query(analysis)
                 
-                # Check cache first
-                events = context_cache.get_calendar_events(time_min, time_max)
-                
-                if events is None:
-                    # Cache miss - fetch from API
-                    events = calendar_client.get_events_from_all_calendars(
+                # Serve from cache (stale entries are refreshed in the background), fetch on a miss
+                events = context_cache.get_calendar_events_swr(
+                    time_min,
+                    time_max,
+                    partial(
+                        calendar_client.get_events_from_all_calendars,
                         time_min=time_min,
                         time_max=time_max,
                         max_results=250
                     )
-                    # Cache the results
-                    context_cache.set_calendar_events(time_min, time_max, events)
+                )
                 
                 # Rank events by relevance to query
                 ranked_events = context_ranker.rank_events(events, message, max_items=50)
@@ -1761,10 +1735,11 @@ def chat(message: str, include_calendar_context: bool = True, include_github_con
                 # Get GitHub data for correlation
                 initialize_github_client()
                 username = github_client.get_user_info().get('login', 'Unknown')
-                repos = context_cache.get_github_data('repos', username=username)
-                if repos is None:
-                    repos = github_client.get_repositories(username, per_page=20)
-                    context_cache.set_github_data('repos', repos, username=username)
+                repos = context_cache.get_github_data_swr(
+                    'repos',
+                    partial(github_client.get_repositories, username, per_page=20),
+                    username=username
+                )
                 
                 issues = []
                 prs = []
@@ -3,7 +3,7 @@
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
-from dotenv import load_dotenv
+from .env import load_dotenv
 
 # Load environment variables
 load_dotenv()
@@ -4,6 +4,12 @@ from datetime import datetime, timedelta
 from typing import Optional
 import re
 
+try:
+    import ciso8601
+    CISO8601_AVAILABLE = True
+except ImportError:
+    CISO8601_AVAILABLE = False
+
 
 def parse_date_reference(text: str, base_date: Optional[datetime] = None) -> Optional[datetime]:
     """
@@ -101,21 +107,63 @@ def parse_time_reference(text: str) -> Optional[tuple[int, int]]:
     return None
 
 
-def format_event_time(event: dict) -> str:
+def get_event_time_str(event: dict, key: str = 'start') -> Optional[str]:
+    """
+    Raw 'dateTime' (or all-day 'date') of an event's start or end.
+    
+    Args:
+        event: Google Calendar event dictionary
+        key: 'start' or 'end'
+    
+    Returns:
+        The time string, or None if the event has none
+    """
+    when = event.get(key)
+    return (when.get('dateTime') or when.get('date')) if when else None
+
+
+def get_event_start(event: dict) -> Optional[datetime]:
+    """
+    Parse an event's start time.
+    
+    Nothing is stored on the event, which may be shared with the context cache;
+    callers that need the value more than once keep it alongside the event.
+    
+    Args:
+        event: Google Calendar event dictionary
+    
+    Returns:
+        Start datetime (aware for timed events, naive midnight for all-day events),
+        or None if missing or unparseable
+    """
+    start_time = get_event_time_str(event)
+    if not start_time:
+        return None
+    
+    try:
+        if CISO8601_AVAILABLE:
+            return ciso8601.parse_datetime(start_time)
+        if 'T' in start_time:
+            return datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+        return datetime.fromisoformat(start_time)
+    except (ValueError, TypeError, AttributeError):
+        # Malformed or non-string value
+        return None
+
+
+def format_event_time(event: dict, start_dt: Optional[datetime] = None) -> str:
     """
     Format event start/end time for display.
     
     Args:
         event: Google Calendar event dictionary
+        start_dt: The event's start from get_event_start, if already parsed
     
     Returns:
         Formatted time string
     """
-    start = event.get('start', {})
-    end = event.get('end', {})
-    
-    start_time = start.get('dateTime') or start.get('date')
-    end_time = end.get('dateTime') or end.get('date')
+    start_time = get_event_time_str(event)
+    end_time = get_event_time_str(event, 'end')
     
     if not start_time:
         return "Time TBD"
@@ -123,7 +171,10 @@ def format_event_time(event: dict) -> str:
     try:
         if 'T' in start_time:
             # Has time component
-            start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+            if start_dt is None:
+                start_dt = get_event_start(event)
+            if start_dt is None:
+                return "Time TBD"
             end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00')) if end_time else None
             
             start_str = start_dt.strftime('%I:%M %p').lstrip('0')
@@ -8,7 +8,7 @@ import streamlit as st
 import sys
 import os
 from datetime import datetime, timedelta
-from dotenv import load_dotenv
+from src.env import load_dotenv
 import pytz
 
 # Load environment variables